@@ -0,0 +1,61 @@
+import importlib
+
+# app_utils is split by concern so a page only pays for what it uses: the
+# recruiter page never loads the sheet writers, the adviser page never loads
+# the text models. Names are resolved on first use, so existing
+# `from app_utils import ...` lines keep working unchanged.
+
+_SUBMODULES = {
+    'merge': [
+        'ADD_REQUEST', 'REMOVE_REQUEST', 'REQUEST_TYPE_COL', 'UPDATE_REQUEST',
+        'add_all_requested', 'apply_requests', 'clean_dfs', 'clean_requests', 'clean_resume_book',
+        'postop_clean_resume_book', 'remove_all_requested', 'update_all_requested',
+    ],
+    'sheets': [
+        'ADVISER_SHEETS_TTL',
+        'load_adviser_sheets', 'read_adviser_sheets', 'read_concurrently', 'sheet_diff_requests', 'sheet_matches_snapshot',
+        'update_gs_requests', 'update_gs_resume_book',
+    ],
+    'snapshot': [
+        'RESUME_BOOK_CSV_URL', 'SNAPSHOT_PATH', 'SNAPSHOT_TTL',
+        'ensure_resume_book_snapshot', 'expire_resume_book_snapshot', 'snapshot_signature',
+    ],
+    'charts': [
+        'generate_shades', 'parse_rgb_string', 'plot_related_words', 'request_history', 'request_times',
+    ],
+    'recruiter': [
+        'POSITION_COL', 'ROLES_COL',
+        'build_role_index', 'cached_export_csv', 'compact_resume_book', 'content_version',
+        'export_csv', 'filter_resume_book', 'recruiter_dataset', 'resume_book_version', 'role_rows',
+    ],
+    'aggregates': [
+        'book_rollups', 'build_rollups', 'position_figure', 'quarter_figure', 'role_figure', 'rollup_role_counts',
+        'rollup_years', 'update_rollups', 'year_figure',
+    ],
+    'identity': [
+        'DUPLICATE_THRESHOLD',
+        'cached_near_duplicates', 'find_near_duplicates', 'soundex',
+    ],
+    'text': [
+        'APPROXIMATE_MIN_DOCS', 'PARALLEL_MIN_DOCS',
+        'analyze_cooccurrence', 'build_bm25_index', 'build_keyword_index', 'build_phrase_matcher',
+        'build_similarity_index', 'build_tfidf_model', 'cached_bm25_index', 'cached_keyword_index',
+        'cached_similarity_index', 'cached_tfidf_model', 'cached_wordcloud_png', 'match_keywords', 'phrase_matches',
+        'preprocess_series', 'preprocess_text', 'rank_resumes', 'related_word_scores', 'search_terms', 'similar_resumes',
+        'word_frequencies',
+    ],
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
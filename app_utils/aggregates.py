@@ -0,0 +1,224 @@
+import pandas as pd
+import streamlit as st
+
+from dataset_store import shared_dataset
+from instrumentation import timed
+from .charts import generate_shades, parse_rgb_string
+from .recruiter import POSITION_COL, ROLES_COL, _role_key, content_version
+
+# Counts behind the recruiter's overview charts, kept per resume-book version.
+# Counts add up over rows, so when the adviser approves requests the new book's
+# counts are the old ones plus those of the rows that changed, and the
+# recruiter page finds them already built when it loads the new snapshot.
+
+def _rollup_rows(book):
+    # only the columns the charts count, normalized so the adviser's sheet read
+    # and the recruiter's snapshot of the same book hash the same
+    return pd.DataFrame({
+        'Grad Year': pd.to_numeric(book['Grad Year'], errors='coerce').astype('Int16').to_numpy(),
+        'Grad Quarter': book['Grad Quarter'].astype('string').to_numpy(),
+        'Position': book[POSITION_COL].astype('string').to_numpy(),
+        'Roles': book[ROLES_COL].astype('string').to_numpy(),
+    })
+
+def _count(rows, weights):
+    # each row counts with its weight; a role picked twice by one row counts once
+    roles = rows['Roles'].fillna('').str.split(',').explode().str.strip()
+    roles = roles[roles != '']
+    picks = pd.DataFrame({'row': roles.index, 'key': roles.map(_role_key).values, 'role': roles.values})
+    picks = picks.drop_duplicates(['row', 'key'])
+
+    return {
+        'years': weights.groupby(rows['Grad Year']).sum(),
+        'quarters': weights.groupby([rows['Grad Year'], rows['Grad Quarter']]).sum(),
+        'positions': weights.groupby(rows['Position']).sum(),
+        'roles': weights.reindex(picks['row']).groupby(picks['key'].values).sum(),
+        'role_names': picks.groupby('key')['role'].agg(lambda s: s.value_counts().index[0]),
+    }
+
+def _combine(rollups, delta):
+    combined = {}
+    for key in ['years', 'quarters', 'positions', 'roles']:
+        counts = rollups[key].add(delta[key], fill_value=0)
+        combined[key] = counts[counts != 0].astype(int)
+    combined['role_names'] = rollups['role_names'].combine_first(delta['role_names'])
+    return combined
+
+@timed("aggregates: build rollups")
+def build_rollups(rows):
+    return _count(rows, pd.Series(1, index=rows.index))
+
+@timed("aggregates: update rollups")
+def _updated_rollups(rollups, old_rows, new_rows):
+    old_hashes = pd.util.hash_pandas_object(old_rows, index=False)
+    new_hashes = pd.util.hash_pandas_object(new_rows, index=False)
+    change = new_hashes.value_counts().sub(old_hashes.value_counts(), fill_value=0)
+    change = change[change != 0]
+
+    # one row per changed hash, weighted by how many copies were added (or removed)
+    both = pd.concat([old_rows.set_axis(old_hashes.values), new_rows.set_axis(new_hashes.values)])
+    changed = both[~both.index.duplicated()].loc[change.index].reset_index(drop=True)
+    return _combine(rollups, _count(changed, pd.Series(change.to_numpy(dtype=int))))
+
+def book_rollups(book):
+    rows = _rollup_rows(book)
+    version = content_version(rows)
+    return version, shared_dataset('rollups', version, lambda: build_rollups(rows))
+
+def update_rollups(old_book, new_book):
+    # called after an approval: old_book is what the sheet held, new_book what was written
+    old_rows, new_rows = _rollup_rows(old_book), _rollup_rows(new_book)
+    old_version, new_version = content_version(old_rows), content_version(new_rows)
+    rollups = shared_dataset('rollups', old_version, lambda: build_rollups(old_rows))
+    return new_version, shared_dataset('rollups', new_version, lambda: _updated_rollups(rollups, old_rows, new_rows))
+
+def rollup_years(rollups):
+    return [int(year) for year in sorted(rollups['years'].index)]
+
+def rollup_role_counts(rollups):
+    roles = rollups['roles']
+    role_counts = pd.DataFrame({"Role": rollups['role_names'].reindex(roles.index).values, "Count": roles.values})
+    return role_counts.sort_values(["Count", "Role"], ascending=[False, True]).reset_index(drop=True)
+
+def _year_color_map(rollups):
+    import plotly.express as px
+
+    base_colors = px.colors.qualitative.Prism_r
+    return {year: base_colors[i % len(base_colors)] for i, year in enumerate(rollup_years(rollups))}
+
+# figure specs are cached per rollup version; reruns from unrelated widgets
+# (keywords, filters) only fetch them
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def year_figure(version, _rollups):
+    import plotly.express as px
+
+    year_counts = _rollups['years'].sort_values(ascending=False, kind='stable').reset_index()
+    year_counts.columns = ['Grad Year', 'Count']
+    year_counts['Grad Year'] = year_counts['Grad Year'].astype(int)
+
+    fig = px.pie(
+        year_counts,
+        names='Grad Year',
+        values='Count',
+        color='Grad Year',
+        color_discrete_map=_year_color_map(_rollups),
+        hole=0.3,
+        height=490
+    )
+    fig.update_traces(textinfo='label+percent', hoverinfo='label+value+percent')
+    fig.update_layout(
+        legend=dict(orientation="h", x=0.5, xanchor="center", y=-0.1),
+        margin=dict(t=40, b=40, l=0, r=0)
+    )
+    return fig.to_dict()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def quarter_figure(version, year, _rollups):
+    import plotly.colors as pc
+    import plotly.express as px
+
+    quarters = _rollups['quarters']
+    quarter_counts = quarters[quarters.index.get_level_values(0) == year].droplevel(0)
+    quarter_counts = quarter_counts.sort_values(ascending=False, kind='stable').reset_index()
+    quarter_counts.columns = ['Grad Quarter', 'Count']
+    quarter_counts = quarter_counts[quarter_counts['Count'] > 0]
+
+    base_color = _year_color_map(_rollups).get(year, "#636EFA")
+    if base_color.startswith("rgb"):
+        base_rgb = parse_rgb_string(base_color)
+    else:
+        base_rgb = pc.hex_to_rgb(base_color)
+
+    lightness_scale = [0.4 + 0.5 * (i / max(1, len(quarter_counts) - 1)) for i in range(len(quarter_counts))]
+    quarter_colors = [
+        pc.label_rgb(tuple(min(int(c * l), 255) for c in base_rgb))
+        for l in lightness_scale
+    ]
+    quarter_color_map = dict(zip(quarter_counts['Grad Quarter'], quarter_colors))
+
+    fig_quarter = px.pie(
+        quarter_counts,
+        names='Grad Quarter',
+        values='Count',
+        color='Grad Quarter',
+        color_discrete_map=quarter_color_map,
+        hole=0.3,
+        title=f'Quarterly Breakdown for {year}',
+    )
+    fig_quarter.update_traces(textinfo='label+percent', hoverinfo='label+value+percent',
+                              domain={'x': [0.1, 0.9], 'y': [0.1, 0.9]})
+    fig_quarter.update_layout(
+        legend=dict(orientation="h", x=0.5, xanchor="center", y=-0.1),
+        margin=dict(t=40, b=40)
+    )
+    return fig_quarter.to_dict()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def position_figure(version, _rollups):
+    import plotly.express as px
+
+    position_counts = _rollups['positions'].reset_index()
+    position_counts.columns = ["Position Type", "Count"]
+    position_counts = position_counts[position_counts["Count"] > 0]
+
+    desired_order = ["Internship", "Full time", "Both"]
+    position_counts["Position Type"] = pd.Categorical(position_counts["Position Type"], categories=desired_order, ordered=True)
+    position_counts = position_counts.sort_values("Position Type")
+
+    custom_colors = generate_shades("#7451c1", len(position_counts))
+
+    fig_position = px.bar(
+        position_counts,
+        x="Count",
+        y="Position Type",
+        text="Count",
+        color="Position Type",
+        orientation='h',
+        height=200,
+        color_discrete_sequence = custom_colors
+    )
+
+    fig_position.update_layout(
+        showlegend=False,
+        xaxis_title="Number of Students",
+        yaxis_title="",
+        margin=dict(t=40, b=40)
+    )
+
+    fig_position.update_traces(textposition='outside')
+    return fig_position.to_dict()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def role_figure(version, _rollups):
+    import plotly.express as px
+
+    role_counts = rollup_role_counts(_rollups)
+    role_counts = role_counts[role_counts["Count"] >= 2]
+
+    max_count = role_counts["Count"].max()
+    min_count = role_counts["Count"].min()
+    use_log_x = (max_count - min_count) > 50
+
+    custom_colors = generate_shades("#1f77b4", len(role_counts))
+
+    fig_roles = px.bar(
+        role_counts,
+        x="Count",
+        y="Role",
+        text="Count",
+        color="Role",
+        orientation="h",
+        color_discrete_sequence = custom_colors
+    )
+
+    fig_roles.update_layout(
+        showlegend=False,
+        xaxis_title="Number of Students",
+        yaxis_title="",
+        margin=dict(t=40, b=40),
+        xaxis_type="log" if use_log_x else "linear"
+    )
+
+    fig_roles.update_traces(textposition='outside')
+    return fig_roles.to_dict()
@@ -0,0 +1,125 @@
+import colorsys
+import re
+from datetime import datetime, timedelta
+
+import matplotlib.colors as mcolors
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# pyplot and seaborn are only imported by the functions that draw with them
+
+@timed("chart: request history")
+def request_history(df, weeks=3):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    today = datetime.now().date()
+
+    days_of_week = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT']
+    start_of_week = today - timedelta(days=today.weekday() + 1) 
+    first_day = start_of_week - timedelta(weeks=weeks - 1)
+
+    # day offsets from the top-left cell, binned straight into the weeks x 7 grid
+    n_cells = weeks * 7
+    last_cell = (today - first_day).days
+    days = (df['Timestamp'].dropna().dt.normalize() - pd.Timestamp(first_day)).dt.days.to_numpy()
+    days = days[(days >= 0) & (days <= min(last_cell, n_cells - 1))]
+    grid = np.bincount(days, minlength=n_cells).astype(float).reshape(weeks, 7)
+    mask = (np.arange(n_cells) > last_cell).reshape(weeks, 7)
+
+    row_labels = [f"{k} wks ago" for k in range(weeks - 1, 1, -1)] + ["Last wk", "This wk"][-weeks:]
+
+    fig = plt.figure(figsize=(10, max(4, 1.3 * weeks)))
+    sns.set(style='white')
+    ax = sns.heatmap(grid, annot=True, fmt=".0f", cmap='coolwarm', mask=mask, 
+                    cbar_kws={'label': 'Count'}, linewidths=0)
+
+    ax.set_xticks(np.arange(7) + 0.5)
+    ax.set_xticklabels(days_of_week, ha="center", size=14)
+    ax.set_yticks(np.arange(weeks) + 0.5)
+    ax.set_yticklabels(row_labels, size=14)
+
+    plt.title(f"Requests - Week View (Today: {today})", size=20)
+    plt.tight_layout()
+    return fig
+
+@timed("chart: request times")
+def request_times(df, weeks=3):
+    import matplotlib.pyplot as plt
+
+    timestamps = pd.to_datetime(df['Timestamp'])
+
+    today = datetime.today()
+    end_of_week = today + timedelta(days=(6 - today.weekday() + 1) % 7)
+    start_of_weeks = end_of_week - timedelta(weeks=weeks)
+
+    timestamps = timestamps[(timestamps >= start_of_weeks) & (timestamps <= end_of_week)]
+
+    # one line per minute of the day, as opaque as that many stacked alpha=0.7 lines
+    minutes = timestamps.dt.hour * 60 + timestamps.dt.minute
+    counts = np.bincount(minutes.to_numpy(dtype=int), minlength=24 * 60)
+    present = np.flatnonzero(counts)
+    colors = np.tile(mcolors.to_rgba('orange'), (len(present), 1))
+    colors[:, 3] = 1 - 0.3 ** counts[present]
+
+    fig = plt.figure(figsize=(10, 2.2))
+
+    plt.vlines(present / 60.0, 0, 1, colors=colors)
+
+    plt.xlim(0, 24)
+    plt.ylim(0, 1)
+    plt.xlabel('Time of Day (Hours)', size=14)
+    plt.title('Request Times', size=20)
+    plt.xticks(range(0, 25, 1), size=14)
+    plt.yticks([])
+
+    plt.gca().spines['top'].set_visible(False)
+    plt.gca().spines['right'].set_visible(False)
+    plt.gca().spines['left'].set_visible(False)
+
+    plt.grid(False)
+    plt.tight_layout()
+    return fig
+
+def parse_rgb_string(rgb_str):
+    return tuple(map(int, re.findall(r'\d+', rgb_str)))
+
+def generate_shades(base_color, n_shades):
+    rgb = mcolors.to_rgb(base_color)
+    h, l, s = colorsys.rgb_to_hls(*rgb)
+
+    lightness_values = [l + (i - n_shades//2)*(0.8/n_shades) for i in range(n_shades)]
+    lightness_values = [min(max(0.15, lv), 0.9) for lv in lightness_values]
+
+    shades = [colorsys.hls_to_rgb(h, lv, s) for lv in lightness_values]
+    return [mcolors.to_hex(rgb) for rgb in shades]
+
+def plot_related_words(user_input, sorted_words, top_n=15):
+    import matplotlib.pyplot as plt
+
+    sorted_words = sorted_words[:top_n]
+    angles = np.linspace(0, 2 * np.pi, len(sorted_words), endpoint=False)
+
+    scores = np.array([score for (_, (score, _, _)) in sorted_words])
+    min_length = 1.5
+    max_length = 4.0
+    norm_scores = (scores - scores.min()) / (scores.max() - scores.min() + 1e-6)
+    lengths = max_length - norm_scores * (max_length - min_length)
+
+    x = lengths * np.cos(angles)
+    y = lengths * np.sin(angles)
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.set_xlim(-max_length - 1, max_length + 1)
+    ax.set_ylim(-max_length - 1, max_length + 1)
+    ax.axis('off')
+
+    ax.text(0, 0, user_input, fontsize=14, ha='center', va='center', bbox=dict(facecolor='pink', boxstyle='circle'))
+
+    for i, ((word, (score, a, b)), xi, yi) in enumerate(zip(sorted_words, x, y)):
+        ax.plot([0, xi], [0, yi], color='gray', linewidth=1)
+        ax.text(xi, yi, word, fontsize=10, ha='center', va='center', bbox=dict(facecolor='lightgreen', boxstyle='round'))
+
+    return fig
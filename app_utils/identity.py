@@ -0,0 +1,146 @@
+import difflib
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from instrumentation import timed
+
+# Finds resume book rows that probably belong to the same student even though
+# the exact email/name matching in apply_requests treats them as different:
+# typos, alternate emails, nicknames. Rows are only compared within blocks that
+# share a cheap key, and blocks too big to compare pairwise fall back to a
+# sorted window, so the work grows roughly linearly with the book.
+
+MAX_BLOCK = 50
+WINDOW = 10
+DUPLICATE_THRESHOLD = 0.85
+
+_SOUNDEX_CODES = {c: str(d) for d, letters in enumerate(
+    ['aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r']) for c in letters}
+
+def soundex(name):
+    letters = [c for c in name if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code = letters[0]
+    last = _SOUNDEX_CODES[letters[0]]
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES[c]
+        if digit != '0' and digit != last:
+            code += digit
+        if c not in 'hw':
+            last = digit
+    return (code + '000')[:4]
+
+def _identity_frame(resume_book):
+    def clean(col):
+        values = resume_book[col].fillna('').astype(str).str.lower().str.replace(r'\s+', '', regex=True)
+        return values.where(values != 'nan', '')
+
+    email = clean('Email')
+    local = email.str.split('@').str[0]
+    return pd.DataFrame({
+        'first': clean('First Name').to_numpy(),
+        'last': clean('Last Name').to_numpy(),
+        'email': email.to_numpy(),
+        'local': local.to_numpy(),
+        # only a blocking key: jdoe and jdoe2 are usually two different NetIDs
+        'user': local.str.replace(r'[^a-z]', '', regex=True).to_numpy(),
+    })
+
+def _blocking_keys(people):
+    first, last = people['first'], people['last']
+    has_name = (first != '') & (last != '')
+    # a row is keyed both ways round so a first/last name swap lands in the same block
+    return [
+        pd.concat([last.str[:3] + '|' + first.str[:1], first.str[:3] + '|' + last.str[:1]]).where(pd.concat([has_name, has_name])),
+        (last.map(soundex) + '|' + first.map(soundex)).where(has_name),
+        people['user'].where(people['user'].str.len() >= 3),
+    ]
+
+def _block_pairs(people, keys):
+    sort_name = (people['last'] + ' ' + people['first']).to_numpy()
+    pairs = []
+    for key in keys:
+        key = key.dropna()
+        rows = key.index.to_numpy()
+        for positions in key.groupby(key.to_numpy()).indices.values():
+            block = np.unique(rows[positions])
+            if len(block) < 2:
+                continue
+            if len(block) <= MAX_BLOCK:
+                pairs.extend(combinations(block, 2))
+                continue
+            # oversized block: compare each row with its neighbours in name order
+            ordered = block[np.argsort(sort_name[block], kind='stable')]
+            for offset in range(1, WINDOW + 1):
+                pairs.extend(zip(ordered[:-offset], ordered[offset:]))
+    pairs = np.sort(np.array(pairs, dtype=int).reshape(-1, 2), axis=1)
+    return np.unique(pairs, axis=0)
+
+def _similarity(a, b, threshold):
+    if not a or not b:
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    # the quick ratios are upper bounds; most pairs in a block are cut off by them
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+def _pair_score(p, q, threshold):
+    if p['email'] and p['email'] == q['email']:
+        return 1.0, "same email"
+
+    name, reasons = 0.0, []
+    # the same username at another domain only counts alongside a fairly close name
+    name_threshold = 2 * threshold - 1 if p['local'] and p['local'] == q['local'] else threshold
+    full = f"{p['first']} {p['last']}"
+    if p['first'] and q['first'] and p['last'] and q['last']:
+        name = _similarity(full, f"{q['first']} {q['last']}", name_threshold)
+        swapped = _similarity(full, f"{q['last']} {q['first']}", name_threshold) if name < threshold else 0.0
+        if name == 1.0:
+            reasons.append("same name")
+        elif swapped > name:
+            name = swapped
+            reasons.append("first/last swapped")
+        elif name > 0:
+            reasons.append("similar name")
+
+    if name_threshold < threshold and name > 0:
+        reasons.insert(0, "same email username")
+        return 0.5 * name + 0.5, ", ".join(reasons)
+    return name, ", ".join(reasons)
+
+@timed("identity: near duplicates")
+def find_near_duplicates(resume_book, threshold=DUPLICATE_THRESHOLD):
+    people = _identity_frame(resume_book)
+    keys = _blocking_keys(people)
+    records = people.to_dict('records')
+
+    found = []
+    for i, j in _block_pairs(people, keys):
+        score, why = _pair_score(records[i], records[j], threshold)
+        if score >= threshold:
+            found.append((i, j, score, why))
+
+    positions = np.array([(i, j) for i, j, _, _ in found], dtype=int).reshape(-1, 2)
+    names = (resume_book['First Name'].astype(str) + ' ' + resume_book['Last Name'].astype(str)).to_numpy()
+    emails = resume_book['Email'].astype(str).to_numpy()
+    duplicates = pd.DataFrame({
+        # sheet rows: one for the header, one because sheets count from 1
+        "Row": positions[:, 0] + 2,
+        "Name": names[positions[:, 0]],
+        "Email": emails[positions[:, 0]],
+        "Other Row": positions[:, 1] + 2,
+        "Other Name": names[positions[:, 1]],
+        "Other Email": emails[positions[:, 1]],
+        "Score": [round(score, 2) for _, _, score, _ in found],
+        "Why": [why for _, _, _, why in found],
+    })
+    return duplicates.sort_values(["Score", "Row"], ascending=[False, True], kind='stable').reset_index(drop=True)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def cached_near_duplicates(version, _resume_book):
+    return find_near_duplicates(_resume_book)
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+def _clean_identity_cols(frame, cols):
+    for col in cols:
+        if col in frame.columns:
+            frame[col] = frame[col].astype(str).str.lower().str.replace(r'\s+', '', regex=True)
+    return frame
+
+@timed("clean: requests")
+def clean_requests(df):
+    return _clean_identity_cols(df, ['Email ', 'Email Address', "First Name", "Last Name"])
+
+@timed("clean: resume book")
+def clean_resume_book(resume_book):
+    return _clean_identity_cols(resume_book, ['Email', 'First Name', "Last Name"])
+
+def clean_dfs(df, resume_book):
+    return clean_requests(df), clean_resume_book(resume_book)
+
+REQUEST_TYPE_COL = "Do you want to add, update, or remove your resume?"
+UPDATE_REQUEST = "I already have a resume in this book and want to update it to a newer version or update my information in the survey."
+ADD_REQUEST = "Add my first resume to this resume book"
+REMOVE_REQUEST = "I am no longer looking for a position and wish to remove my resume."
+
+def _book_rows(requests, resume_book):
+    df_update_cols = requests.loc[:, "First Name":"Upload Resume"].columns.tolist()
+    df_update_cols = [col for col in df_update_cols if col != REQUEST_TYPE_COL]
+
+    rows = requests[df_update_cols]
+    rows.columns = resume_book.columns
+    return rows
+
+def _check_emails(requests, action):
+    email = requests["Email "]
+    email2 = requests["Email Address"]
+    missing = (email.isna() & email2.isna()) | (email == "")
+
+    if missing.any():
+        raise ValueError(f"Email is missing for row {missing.idxmax()} where resume {action} is requested.")
+
+def _positions(keys, wanted):
+    # key -> positions of the rows holding it, for the rows whose key is wanted
+    hits = np.flatnonzero(wanted)
+    table = {}
+    for pos, key in zip(hits.tolist(), keys[hits]):
+        table.setdefault(key, []).append(pos)
+    return table
+
+def _drop_superseded(resume_book, update_rows):
+    # for each update in request order, the rows sharing one of its emails and then
+    # the rows sharing its exact name collapse to the one added last. Only rows an
+    # update mentions are indexed, so each update costs its matches, not a book scan.
+    emails = resume_book["Email"]
+    by_email = _positions(emails.to_numpy(), emails.isin(set(update_rows["Email "]) | set(update_rows["Email Address"])).to_numpy())
+    names = pd.MultiIndex.from_frame(resume_book[["First Name", "Last Name"]])
+    by_name = _positions(names, names.isin(pd.MultiIndex.from_frame(update_rows[["First Name", "Last Name"]])))
+
+    present = [True] * len(resume_book)
+    cols = ["Email ", "Email Address", "First Name", "Last Name"]
+    for email, email2, firstname, lastname in update_rows[cols].itertuples(index=False):
+        by_either = set(by_email.get(email, ())).union(by_email.get(email2, ()))
+        for matches in (by_either, by_name.get((firstname, lastname), ())):
+            matches = sorted(i for i in matches if present[i])
+            for i in matches[:-1]:
+                present[i] = False
+    return resume_book[np.array(present, dtype=bool)]
+
+def _removal_mask(resume_book, requests):
+    emails = pd.concat([requests["Email "], requests["Email Address"]]).dropna()
+    by_email = resume_book["Email"].isin(set(emails))
+
+    email_counts = resume_book["Email"][by_email].value_counts()
+    for email in email_counts.index[email_counts > 1]:
+        print(f"Warning: Multiple rows found in resume_book with the email {email}. Deleting all matching rows.")
+
+    # requests whose emails are not in the book fall back to an exact name match
+    found = set(email_counts.index)
+    fallback = requests[~(requests["Email "].isin(found) | requests["Email Address"].isin(found))]
+
+    names = pd.MultiIndex.from_frame(resume_book[["First Name", "Last Name"]])
+    name_counts = names[~by_email.values].value_counts()
+    fallback_names = pd.MultiIndex.from_frame(fallback[["First Name", "Last Name"]]).unique()
+    fallback_counts = name_counts.reindex(fallback_names, fill_value=0)
+
+    for (firstname, lastname) in fallback_counts.index[fallback_counts > 1]:
+        print(f"Warning: Multiple rows found in resume_book with the name {firstname} {lastname}. Abort deletion.")
+
+    by_name = names.isin(fallback_counts.index[fallback_counts == 1]) & ~by_email.values
+    return by_email.values | by_name
+
+@timed("merge: apply requests")
+def apply_requests(df, resume_book, request_types=(REMOVE_REQUEST, ADD_REQUEST, UPDATE_REQUEST)):
+    requested = df[REQUEST_TYPE_COL]
+    new_rows = []
+
+    if REMOVE_REQUEST in request_types:
+        remove_rows = df[requested == REMOVE_REQUEST]
+        print(f"Deleting rows for {remove_rows['Email ']}")
+        _check_emails(remove_rows, "removal")
+        resume_book = resume_book[~_removal_mask(resume_book, remove_rows)]
+
+    if ADD_REQUEST in request_types:
+        new_rows.append(_book_rows(df[requested == ADD_REQUEST], resume_book))
+
+    if UPDATE_REQUEST in request_types:
+        update_rows = df[requested == UPDATE_REQUEST]
+        init_len = len(update_rows)
+        update_rows = update_rows.drop_duplicates(subset=["Email "], keep="last")
+        update_rows = update_rows.drop_duplicates(subset=["First Name", "Last Name"], keep="last")
+        print(f"{init_len - len(update_rows)} same-user updates removed. {len(update_rows)} updates to make.")
+        _check_emails(update_rows, "update")
+        new_rows.append(_book_rows(update_rows, resume_book))
+
+    new_rows = [rows for rows in new_rows if len(rows)]
+    resume_book = pd.concat([resume_book, *new_rows], ignore_index=True)
+
+    if UPDATE_REQUEST in request_types and len(update_rows):
+        resume_book = _drop_superseded(resume_book, update_rows)
+
+    return resume_book
+
+def update_all_requested(df, resume_book):
+    return apply_requests(df, resume_book, [UPDATE_REQUEST])
+
+def add_all_requested(df, resume_book):
+    return apply_requests(df, resume_book, [ADD_REQUEST])
+
+def remove_all_requested(df, resume_book):
+    return apply_requests(df, resume_book, [REMOVE_REQUEST])
+
+@timed("clean: postop")
+def postop_clean_resume_book(resume_book):
+    resume_book = resume_book.reset_index(drop=True)
+    resume_book['First Name'] = resume_book['First Name'].str.capitalize()
+    resume_book['Last Name'] = resume_book['Last Name'].str.capitalize()
+    return resume_book
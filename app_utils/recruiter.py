@@ -0,0 +1,113 @@
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset_store import shared_dataset
+from instrumentation import timed
+from .snapshot import SNAPSHOT_PATH, ensure_resume_book_snapshot
+
+POSITION_COL = "Are you looking for an internship or full-time position?"
+ROLES_COL = "What types of roles are you looking for?"
+
+def _role_key(role):
+    return ' '.join(role.split()).casefold()
+
+@timed("recruiter: role index")
+def build_role_index(role_series):
+    # role -> positions of the rows that picked it, matched on whole, normalized
+    # role names so "Data Science" no longer matches "Data Science Research"
+    role_lists = role_series.fillna('').astype(str).str.split(',')
+    role_lists.index = np.arange(len(role_series))
+    exploded = role_lists.explode().str.strip()
+    exploded = exploded[exploded != '']
+
+    # the most common spelling of each role is the one shown to recruiters
+    rows, spellings = {}, {}
+    for key, group in exploded.groupby(exploded.map(_role_key).to_numpy()):
+        rows[key] = np.unique(group.index.to_numpy())
+        spellings[key] = group.value_counts().index[0]
+    roles = sorted(rows, key=lambda key: (-len(rows[key]), spellings[key]))
+    return {'roles': [spellings[key] for key in roles], 'rows': rows, 'n_rows': len(role_series)}
+
+def role_rows(role_index, roles):
+    mask = np.zeros(role_index['n_rows'], dtype=bool)
+    for role in roles:
+        mask[role_index['rows'].get(_role_key(role), [])] = True
+    return mask
+
+def compact_resume_book(resume_book):
+    book = resume_book.copy()
+    book['Grad Year'] = pd.to_numeric(book['Grad Year'], errors='coerce').astype('Int16')
+    for col in ['Grad Quarter', POSITION_COL]:
+        book[col] = book[col].astype('category')
+    return book, build_role_index(book[ROLES_COL])
+
+@timed("recruiter: filter")
+def filter_resume_book(resume_book, grad_year_range, quarters, roles, role_index=None):
+    if role_index is None:
+        role_index = build_role_index(resume_book[ROLES_COL])
+    return resume_book[
+        (resume_book["Grad Year"] >= grad_year_range[0]).to_numpy(dtype=bool, na_value=False) &
+        (resume_book["Grad Year"] <= grad_year_range[1]).to_numpy(dtype=bool, na_value=False) &
+        resume_book["Grad Quarter"].isin(quarters).to_numpy() &
+        role_rows(role_index, roles)
+    ]
+
+@timed("recruiter: export csv")
+def export_csv(frame, chunk_rows=2000):
+    buffer = io.BytesIO()
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        frame.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=(start == 0), encoding='utf-8')
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_export_csv(signature, _make_frame):
+    return export_csv(_make_frame())
+
+def content_version(data):
+    hashed = pd.util.hash_pandas_object(data, index=False)
+    return hashlib.sha1(hashed.values.tobytes()).hexdigest()
+
+def resume_book_version(resume_book):
+    # content hash of the resume texts, used to key the shared caches below
+    return content_version(resume_book['Resume Full Text'])
+
+@timed("recruiter: build dataset")
+def _recruiter_dataset(resume_book, book_version):
+    from .aggregates import book_rollups
+
+    book, role_index = compact_resume_book(resume_book)
+    rollup_version, rollups = book_rollups(book)
+    return {
+        'book': book,
+        'role_index': role_index,
+        # every column; 'version' only covers the texts the text caches are built from
+        'book_version': book_version,
+        'version': resume_book_version(book),
+        'text_series': book['Resume Full Text'].dropna(),
+        'rollup_version': rollup_version,
+        'rollups': rollups,
+    }
+
+# snapshot file signature -> content version of the book it held
+_snapshot_versions = {}
+MAX_SNAPSHOT_VERSIONS = 8
+
+def recruiter_dataset():
+    # one compact copy per resume book content, shared by every recruiter session.
+    # The file is only read again when its signature (inode, size, mtime) moves;
+    # a refresh that downloads the same book maps to the version already built.
+    signature = ensure_resume_book_snapshot()
+    resume_book = None
+    version = _snapshot_versions.get(signature)
+    if version is None:
+        resume_book = pd.read_parquet(SNAPSHOT_PATH)
+        version = _snapshot_versions[signature] = content_version(resume_book)
+        while len(_snapshot_versions) > MAX_SNAPSHOT_VERSIONS:
+            _snapshot_versions.pop(next(iter(_snapshot_versions)))
+
+    return shared_dataset('recruiter', version, lambda: _recruiter_dataset(
+        resume_book if resume_book is not None else pd.read_parquet(SNAPSHOT_PATH), version))
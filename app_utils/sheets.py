@@ -0,0 +1,223 @@
+import difflib
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from gs_clients import REQUESTS_URL, RESUME_BOOK_ID, RESUME_BOOK_URL, get_sheets_service, get_spreadsheet, get_worksheet
+from instrumentation import timed
+
+def _cell_value(value):
+    if isinstance(value, (bool, np.bool_)):
+        return {"boolValue": bool(value)}
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return {} if pd.isna(value) else {"numberValue": float(value)}
+    if value is None or value is pd.NaT or value is pd.NA:
+        return {}
+    return {"stringValue": str(value)}
+
+def _row_cells(row):
+    values = [_cell_value(v) for v in row]
+    return [{"userEnteredValue": v} if v else {} for v in values]
+
+def _rows_range(sheet_id, start, end):
+    return {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": start, "endIndex": end}
+
+@timed("sheets: diff")
+def sheet_diff_requests(sheet_id, old, new):
+    # batchUpdate requests turning a sheet holding old (header in row 0) into new;
+    # None means the header changed and the sheet needs a full rewrite
+    if list(old.columns) != list(new.columns):
+        return None
+
+    old_rows = list(old.itertuples(index=False))
+    new_rows = list(new.itertuples(index=False))
+    matcher = difflib.SequenceMatcher(
+        None,
+        pd.util.hash_pandas_object(old, index=False).tolist(),
+        pd.util.hash_pandas_object(new, index=False).tolist(),
+        autojunk=False,
+    )
+
+    # walk the blocks bottom-up so row indices above each block stay valid
+    requests = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == 'equal':
+            continue
+        k = min(i2 - i1, j2 - j1)
+
+        if i2 - i1 > k:
+            requests.append({"deleteDimension": {"range": _rows_range(sheet_id, i1 + k + 1, i2 + 1)}})
+
+        if j2 - j1 > k:
+            rows = [{"values": _row_cells(row)} for row in new_rows[j1 + k:j2]]
+            if i2 == len(old_rows):
+                requests.append({"appendCells": {"sheetId": sheet_id, "rows": rows, "fields": "userEnteredValue"}})
+            else:
+                requests.append({"insertDimension": {
+                    "range": _rows_range(sheet_id, i2 + 1, i2 + 1 + len(rows)),
+                    "inheritFromBefore": True,
+                }})
+                requests.append({"updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": i2 + 1, "columnIndex": 0},
+                    "rows": rows,
+                    "fields": "userEnteredValue",
+                }})
+
+        for offset in range(k):
+            old_cells = _row_cells(old_rows[i1 + offset])
+            new_cells = _row_cells(new_rows[j1 + offset])
+            changed = [c for c, (a, b) in enumerate(zip(old_cells, new_cells)) if a != b]
+            if changed:
+                requests.append({"updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": i1 + offset + 1, "columnIndex": changed[0]},
+                    "rows": [{"values": new_cells[changed[0]:changed[-1] + 1]}],
+                    "fields": "userEnteredValue",
+                }})
+
+    return requests
+
+def _sheet_text(value):
+    # how a value read into a frame shows up in the sheet's formatted cells
+    if pd.isna(value):
+        return ''
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+@timed("sheets: check snapshot")
+def sheet_matches_snapshot(sheet, snapshot, key_col):
+    # the diff addresses rows and columns by position, so it is only safe while
+    # the sheet still holds the snapshot row for row. Reads drop blank rows and
+    # unnamed empty columns, and other sessions or the batch runner may have
+    # written since, so compare the header and one key column as they are now.
+    if key_col not in snapshot.columns:
+        return False
+    header = sheet.row_values(1)
+    if header != [str(col) for col in snapshot.columns]:
+        return False
+    values = sheet.col_values(header.index(key_col) + 1)[1:]
+    expected = [_sheet_text(value) for value in snapshot[key_col]]
+    # the API leaves out trailing empty cells
+    while expected and not expected[-1]:
+        expected.pop()
+    return values == expected
+
+def _snapshot_diff(sheet, snapshot, frame, key_col):
+    if snapshot is None:
+        return None
+    if not sheet_matches_snapshot(sheet, snapshot, key_col):
+        print("Sheet no longer matches the snapshot; rewriting it.")
+        return None
+    return sheet_diff_requests(sheet.id, snapshot, frame)
+
+def update_gs_resume_book(resume_book, snapshot=None):
+    from gspread_dataframe import set_with_dataframe
+
+    sheet = get_worksheet(RESUME_BOOK_URL, 1)
+
+    # with a snapshot of what the sheet holds, only send the changed rows and cells
+    diff = _snapshot_diff(sheet, snapshot, resume_book, 'Email')
+    if diff is None:
+        with timed("sheets: rewrite resume book"):
+            sheet.clear()
+            set_with_dataframe(sheet, resume_book)
+        print("Sheet updated successfully.")
+        diff = []
+    else:
+        print(f"Sheet updated incrementally with {len(diff)} changes.")
+    
+    num_rows = math.ceil(len(resume_book) / 100) * 100
+
+    service = get_sheets_service()
+
+    body = {
+        "requests": diff + [
+            # Resize rows
+            {
+                "updateDimensionProperties": {
+                    "range": {
+                        "sheetId": 0,
+                        "dimension": "ROWS",
+                        "startIndex": 0,
+                        "endIndex": num_rows
+                    },
+                    "properties": {
+                        "pixelSize": 21
+                    },
+                    "fields": "pixelSize"
+                }
+            },
+            # Set text clipping
+            {
+                "repeatCell": {
+                    "range": {
+                        "sheetId": 0,
+                        "startRowIndex": 0,
+                        "startColumnIndex": 10,
+                        "endColumnIndex": 13
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "wrapStrategy": "WRAP"
+                        }
+                    },
+                    "fields": "userEnteredFormat.wrapStrategy"
+                }
+            }
+        ]
+    }
+
+    with timed("sheets: batchUpdate resume book"):
+        response = service.spreadsheets().batchUpdate(
+            spreadsheetId=RESUME_BOOK_ID,
+            body=body
+        ).execute()
+
+    print("Rows resized and text clipping set successfully.")
+    
+def update_gs_requests(df, snapshot=None):
+    from gspread_dataframe import set_with_dataframe
+
+    sheet = get_worksheet(REQUESTS_URL, 0)
+
+    diff = _snapshot_diff(sheet, snapshot, df, 'Timestamp')
+    if diff is None:
+        with timed("sheets: rewrite requests"):
+            sheet.clear()
+            set_with_dataframe(sheet, df)
+        print("Sheet updated successfully.")
+    else:
+        if diff:
+            with timed("sheets: batchUpdate requests"):
+                get_spreadsheet(REQUESTS_URL).batch_update({"requests": diff})
+        print(f"Sheet updated incrementally with {len(diff)} changes.")
+
+ADVISER_SHEETS_TTL = 60
+
+def read_concurrently(reads):
+    # runs each zero-argument read in its own thread, so the wall time is the
+    # slowest read rather than the sum; threads share the page's script context
+    ctx = get_script_run_ctx(suppress_warning=True)
+    with ThreadPoolExecutor(max_workers=len(reads), initializer=add_script_run_ctx, initargs=(None, ctx)) as pool:
+        futures = {name: pool.submit(read) for name, read in reads.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def _timed_read(stage, conn, worksheet):
+    with timed(stage):
+        return conn.read(worksheet=worksheet, ttl=0)
+
+def read_adviser_sheets(requests_conn, resume_book_conn):
+    frames = read_concurrently({
+        'requests': lambda: _timed_read("sheets: read requests", requests_conn, "Form Responses 1"),
+        'resume_book': lambda: _timed_read("sheets: read resume book", resume_book_conn, "Resume Book"),
+    })
+    return frames['requests'], frames['resume_book']
+
+# short-lived so button clicks reuse the last read; cleared after every approval
+@st.cache_data(ttl=ADVISER_SHEETS_TTL, show_spinner=False)
+def load_adviser_sheets(_requests_conn, _resume_book_conn):
+    return read_adviser_sheets(_requests_conn, _resume_book_conn)
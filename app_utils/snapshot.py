@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from instrumentation import timed
+
+# Local Parquet copy of the resume book that the recruiter page reads instead
+# of the sheet. Kept apart from sheets.py so the recruiter page never loads the
+# Sheets API clients and writers.
+
+RESUME_BOOK_CSV_URL = "https://docs.google.com/spreadsheets/d/1xqvrDynnWfslrSnOymMtJCrMvmAQBka70L7i8USc5Bs/export?format=csv&gid=0"
+SNAPSHOT_PATH = os.path.join(".cache", "resume_book.parquet")
+SNAPSHOT_TTL = 15 * 60
+
+_snapshot_lock = threading.Lock()
+
+def _snapshot_age(path):
+    return time.time() - os.path.getmtime(path)
+
+@timed("sheets: download resume book csv")
+def _download_snapshot(csv_url, path):
+    resume_book = pd.read_csv(csv_url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    resume_book.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def _refresh_snapshot(csv_url, path, ttl):
+    # one refresh at a time; sessions that find it already running keep the old copy
+    if not _snapshot_lock.acquire(blocking=False):
+        return
+    try:
+        if _snapshot_age(path) > ttl:
+            _download_snapshot(csv_url, path)
+    except Exception as e:
+        print(f"Resume book snapshot refresh failed: {e}")
+    finally:
+        _snapshot_lock.release()
+
+def ensure_resume_book_snapshot(csv_url=RESUME_BOOK_CSV_URL, path=SNAPSHOT_PATH, ttl=SNAPSHOT_TTL):
+    if not os.path.exists(path):
+        with _snapshot_lock:
+            if not os.path.exists(path):
+                _download_snapshot(csv_url, path)
+    elif _snapshot_age(path) > ttl:
+        threading.Thread(target=_refresh_snapshot, args=(csv_url, path, ttl), daemon=True).start()
+
+    return snapshot_signature(path)
+
+def snapshot_signature(path=SNAPSHOT_PATH):
+    # changes whenever the file is replaced or expired, even if its mtime is reused
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+def expire_resume_book_snapshot(path=SNAPSHOT_PATH, ttl=SNAPSHOT_TTL):
+    # the next page load serves the current copy and refreshes it in the background;
+    # backdated from now rather than to a fixed time, so no two expiries look alike
+    if os.path.exists(path):
+        stale = time.time() - ttl - 1
+        os.utime(path, (stale, stale))
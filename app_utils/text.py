@@ -0,0 +1,363 @@
+import functools
+import io
+import math
+import os
+import re
+import heapq
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import ahocorasick
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset_store import shared_dataset
+from instrumentation import timed
+from .charts import plot_related_words
+from .recruiter import content_version
+
+# sklearn and wordcloud are only imported when a model or image is built
+
+# keyword pieces whose posting sets each index keeps; one can be as large as the book
+PIECE_CACHE_SIZE = 64
+
+@timed("text: keyword index")
+def build_keyword_index(text_series):
+    texts = text_series.fillna('').astype(str).str.lower()
+    postings = {}
+    for row_id, text in texts.items():
+        for token in set(text.split()):
+            postings.setdefault(token, set()).add(row_id)
+    vocab = list(postings)
+
+    @functools.lru_cache(maxsize=PIECE_CACHE_SIZE)
+    def piece_postings(piece):
+        # rows with a whitespace token containing piece
+        return set().union(*(postings[t] for t in vocab if piece in t))
+
+    return {
+        'texts': texts,
+        'postings': postings,
+        'vocab': vocab,
+        'all_ids': set(texts.index),
+        'piece_postings': piece_postings,
+    }
+
+# the indexes and models below are kept in the shared dataset store, so they
+# count towards its memory budget and are evicted with old book versions
+
+def cached_keyword_index(version, text_series):
+    return shared_dataset('keyword_index', version, lambda: build_keyword_index(text_series))
+
+def _keyword_candidates(index, keyword):
+    pieces = keyword.split()
+    if not pieces:
+        return index['all_ids']
+    return set.intersection(*(index['piece_postings'](p) for p in pieces))
+
+def build_phrase_matcher(phrases):
+    automaton = ahocorasick.Automaton()
+    for phrase in set(phrases):
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+def phrase_matches(automaton, text):
+    return {phrase for _, phrase in automaton.iter(text)}
+
+@timed("recruiter: keyword match")
+def match_keywords(index, row_ids, keywords):
+    matched = {row_id: [] for row_id in row_ids}
+    hits = {}
+
+    # single tokens are answered exactly by the posting lists
+    phrases = []
+    for kw in set(keywords):
+        if kw.split() == [kw]:
+            hits[kw] = _keyword_candidates(index, kw)
+        else:
+            phrases.append(kw)
+
+    # phrases can span tokens, so scan each candidate text once for all of them
+    if phrases:
+        candidates = {kw: _keyword_candidates(index, kw) for kw in phrases}
+        to_scan = set().union(*candidates.values()).intersection(matched)
+        automaton = build_phrase_matcher(phrases)
+        found = {row_id: phrase_matches(automaton, index['texts'][row_id]) for row_id in to_scan}
+        for kw in phrases:
+            hits[kw] = {row_id for row_id, f in found.items() if kw in f}
+
+    for kw in keywords:
+        small, large = (hits[kw], matched) if len(hits[kw]) < len(matched) else (matched, hits[kw])
+        for row_id in small:
+            if row_id in large:
+                matched[row_id].append(kw)
+    return pd.Series([matched[row_id] for row_id in row_ids], index=row_ids, dtype=object)
+
+_DIGIT_WORDS = re.compile(r'\b\w*\d\w*\b')
+_SYMBOL_WORDS = re.compile(r'\b\w*[^a-zA-Z\s]\w*\b')
+PARALLEL_MIN_DOCS = 20000
+
+def _clean_token(token):
+    # neither pattern can match across whitespace, so each token is cleaned on its
+    # own; plain ascii words, nearly all of a resume, skip the regexes entirely
+    if not (token.isascii() and token.isalpha()):
+        token = _SYMBOL_WORDS.sub('', _DIGIT_WORDS.sub('', token))
+    if not token or (token[0] == 'i' and len(token) <= 2):
+        return ''
+    if len(token) > 1 and token.count(token[0]) == len(token):
+        return ''
+    return token
+
+class _TokenCache(dict):
+    def __missing__(self, token):
+        cleaned = self[token] = _clean_token(token)
+        return cleaned
+
+def preprocess_text(text, cache=None):
+    cache = _TokenCache() if cache is None else cache
+    return ' '.join(filter(None, map(cache.__getitem__, text.lower().split())))
+
+def _preprocess_batch(texts):
+    cache = _TokenCache()
+    return [preprocess_text(text, cache) for text in texts]
+
+@timed("text: preprocess")
+def preprocess_series(text_series, workers=None):
+    # same output as text_series.apply(preprocess_text); each distinct token is
+    # cleaned once per batch, and big corpora are split across processes
+    texts = text_series.tolist()
+    workers = workers or os.cpu_count() or 1
+
+    if len(texts) >= PARALLEL_MIN_DOCS and workers > 1:
+        size = math.ceil(len(texts) / workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            docs = [doc for chunk in pool.map(_preprocess_batch, [texts[i:i + size] for i in range(0, len(texts), size)])
+                    for doc in chunk]
+    else:
+        docs = _preprocess_batch(texts)
+
+    return pd.Series(docs, index=text_series.index, dtype=object)
+
+def word_frequencies(text_series):
+    from wordcloud import STOPWORDS
+
+    counts = Counter()
+    for text in preprocess_series(text_series):
+        counts.update(text.split())
+    for word in STOPWORDS:
+        counts.pop(word, None)
+    return counts
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def cached_wordcloud_png(version, _text_series):
+    from wordcloud import WordCloud
+
+    with timed("chart: word cloud"):
+        wordcloud = WordCloud(
+            width=800,
+            height=400,
+            background_color='white',
+            collocations=False
+        ).generate_from_frequencies(word_frequencies(_text_series))
+
+        buffer = io.BytesIO()
+        wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+@timed("text: tfidf fit")
+def build_tfidf_model(text_series):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from wordcloud import STOPWORDS
+
+    docs = preprocess_series(text_series)
+    vectorizer = TfidfVectorizer(stop_words=list(STOPWORDS), min_df=1)
+    tfidf_matrix = vectorizer.fit_transform(docs)
+    feature_names = vectorizer.get_feature_names_out()
+    presence = (tfidf_matrix > 0).astype(np.int32).tocsc()
+
+    return {
+        'vectorizer': vectorizer,
+        'tfidf_matrix': tfidf_matrix,
+        'feature_names': feature_names,
+        'word_index': {word: i for i, word in enumerate(feature_names)},
+        'presence': presence,
+        'doc_freq': np.asarray(presence.sum(axis=0)).ravel(),
+        'row_ids': pd.Index(text_series.index),
+    }
+
+def cached_tfidf_model(version, text_series):
+    return shared_dataset('tfidf_model', version, lambda: build_tfidf_model(text_series))
+
+_TERM_TRAIL = ''.join(c for c in string.punctuation if c not in '+#')
+_TERM_LEAD = _TERM_TRAIL.replace('.', '')
+
+class _TermCache(dict):
+    def __missing__(self, token):
+        term = token.rstrip(_TERM_TRAIL).lstrip(_TERM_LEAD)
+        # dates, phone numbers and GPAs are never searched for
+        self[token] = term = term if any(c.isalpha() for c in term) else ''
+        return term
+
+def search_terms(text, cache=None):
+    # whitespace tokens with the punctuation around them trimmed, so c++, c#,
+    # .net, node.js and python3 stay whole, as the keyword filter sees them
+    cache = _TermCache() if cache is None else cache
+    return [term for term in map(cache.__getitem__, text.lower().split()) if term]
+
+@timed("text: bm25 index")
+def build_bm25_index(text_series, k1=1.5, b=0.75):
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    # no stop words: short ones like r, c and it are also what recruiters search
+    # for, and the idf already leaves common words next to no weight
+    texts = text_series.fillna('').astype(str)
+    cache = _TermCache()
+    vectorizer = CountVectorizer(analyzer=lambda text: search_terms(text, cache))
+    weights = vectorizer.fit_transform(texts).tocsc().astype(np.float32)
+
+    # replace each raw term count with its BM25 weight so a query is a sum of columns
+    doc_len = np.asarray(weights.sum(axis=1)).ravel()
+    avg_len = doc_len.mean() or 1.0
+    doc_freq = np.diff(weights.indptr)
+    idf = np.log(1 + (len(texts) - doc_freq + 0.5) / (doc_freq + 0.5))
+    rows = weights.indices
+    cols = np.repeat(np.arange(weights.shape[1]), doc_freq)
+    tf = weights.data
+    weights.data = (idf[cols] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[rows] / avg_len))).astype(np.float32)
+
+    return {
+        'weights': weights,
+        'vocab': vectorizer.vocabulary_,
+        'row_ids': pd.Index(texts.index),
+    }
+
+def cached_bm25_index(version, text_series):
+    return shared_dataset('bm25_index', version, lambda: build_bm25_index(text_series))
+
+@timed("recruiter: bm25 ranking")
+def rank_resumes(index, keywords, row_ids, k=50):
+    terms = {t for kw in keywords for t in search_terms(kw) if t in index['vocab']}
+    if not terms:
+        return []
+
+    # only resumes containing a query term get a score
+    postings = index['weights'][:, sorted(index['vocab'][t] for t in terms)]
+    positions, inverse = np.unique(postings.indices, return_inverse=True)
+    scores = np.bincount(inverse, weights=postings.data)
+
+    allowed = np.isin(positions, index['row_ids'].get_indexer(row_ids))
+    top = heapq.nlargest(k, zip(scores[allowed], positions[allowed]))
+    return [(index['row_ids'][pos], float(score)) for score, pos in top]
+
+# "more like this": cosine similarity between resumes' tf-idf vectors. The
+# vectorizer already scales every row to unit length, so similarity is a plain
+# sparse dot product. Big books also get a random projection to a small dense
+# matrix; searching it is one matrix-vector product, and only its best
+# candidates are rescored exactly.
+
+APPROXIMATE_MIN_DOCS = 20000
+PROJECTION_DIMS = 256
+RESCORE_FACTOR = 10
+
+@timed("text: similarity index")
+def build_similarity_index(model, projection_dims=None, seed=0):
+    vectors = model['tfidf_matrix'].tocsr().astype(np.float32)
+    if projection_dims is None:
+        projection_dims = PROJECTION_DIMS if vectors.shape[0] >= APPROXIMATE_MIN_DOCS else 0
+
+    projected = None
+    if projection_dims:
+        rng = np.random.default_rng(seed)
+        projection = rng.standard_normal((vectors.shape[1], projection_dims), dtype=np.float32)
+        projected = np.asarray(vectors @ projection)
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        projected /= np.where(norms > 0, norms, 1)
+
+    return {
+        'vectors': vectors,
+        'projected': projected,
+        'row_ids': model['row_ids'],
+    }
+
+def cached_similarity_index(version, text_series):
+    return shared_dataset('similarity_index', version,
+                          lambda: build_similarity_index(cached_tfidf_model(version, text_series)))
+
+def _top_k(scores, positions, k):
+    if len(positions) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        scores, positions = scores[best], positions[best]
+    order = np.lexsort((positions, -scores))
+    return scores[order], positions[order]
+
+@timed("recruiter: similar resumes")
+def similar_resumes(index, row_id, row_ids, k=10, approximate=None):
+    ids, vectors, projected = index['row_ids'], index['vectors'], index['projected']
+    query = ids.get_loc(row_id)
+    candidates = ids.get_indexer(row_ids)
+    candidates = candidates[(candidates >= 0) & (candidates != query)]
+    if not len(candidates):
+        return []
+
+    if approximate is None:
+        approximate = projected is not None
+    if approximate and projected is not None and len(candidates) > k * RESCORE_FACTOR:
+        # shortlist on the projection, then rescore the shortlist exactly
+        rough = (projected @ projected[query])[candidates]
+        _, candidates = _top_k(rough, candidates, k * RESCORE_FACTOR)
+        scores = (vectors[candidates] @ vectors[query].T).toarray().ravel()
+    else:
+        scores = (vectors @ vectors[query].T).toarray().ravel()[candidates]
+
+    scores, positions = _top_k(scores, candidates, k)
+    return [(ids[pos], float(score)) for score, pos in zip(scores, positions)]
+
+@timed("text: cooccurrence scores")
+def related_word_scores(model, user_idx, alpha=1.0, beta=0.5):
+    presence = model['presence']
+    user_presence = presence[:, user_idx].toarray().ravel()
+    count_with_user = user_presence.sum()
+
+    if count_with_user == 1:
+        print("User word occurs in only 1 resume")
+        filter_threshold = 1
+    else:
+        filter_threshold = 2
+
+    # a: resumes with both words, b: resumes with the candidate word only
+    a = presence.T @ user_presence
+    b = model['doc_freq'] - a
+    scores = alpha * a - beta * b
+
+    candidates = np.flatnonzero(a >= filter_threshold)
+    candidates = candidates[candidates != user_idx]
+    candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    feature_names = model['feature_names']
+    return [(feature_names[i], (float(scores[i]), int(a[i]), int(b[i]))) for i in candidates]
+
+def analyze_cooccurrence(st, user_input, alpha=1.0, beta=0.5):
+    text_series = st.session_state['text_series']
+    version = st.session_state.get('resume_book_version') or content_version(text_series)
+    model = cached_tfidf_model(version, text_series)
+    word_index = model['word_index']
+
+    if user_input not in word_index:
+        st.warning(f"'{user_input}' not found in vocabulary.")
+        return
+
+    user_idx = word_index[user_input]
+    sorted_words = related_word_scores(model, user_idx, alpha=alpha, beta=beta)
+    if not sorted_words:
+        return
+
+    # st.write("Top related words:")
+    # for word, (score, a, b) in sorted_words[:10]:
+    #     st.write(f"{word}: score={score:.2f} (with={a}, without={b})")
+
+    fig = plot_related_words(user_input, sorted_words)
+
+    return fig
@@ -0,0 +1,127 @@
+import argparse
+
+import pandas as pd
+from gspread_dataframe import get_as_dataframe
+
+from app_utils import (ADD_REQUEST, REMOVE_REQUEST, REQUEST_TYPE_COL, UPDATE_REQUEST, apply_requests, clean_requests, clean_resume_book,
+                       expire_resume_book_snapshot, postop_clean_resume_book, sheet_diff_requests, update_gs_requests,
+                       update_gs_resume_book)
+from gs_clients import REQUESTS_URL, RESUME_BOOK_URL, get_worksheet
+from instrumentation import session_timings, stage_summary, timed
+
+# Runs the adviser page's approval pipeline without a browser session, e.g. from cron:
+#   python batch_update.py --dry-run
+#   python batch_update.py
+#   python batch_update.py --requests requests.csv --resume-book resume_book.parquet
+
+SHEETS = "sheets"
+REQUEST_TYPES = {"remove": REMOVE_REQUEST, "add": ADD_REQUEST, "update": UPDATE_REQUEST}
+
+def _read_sheet(url, index):
+    # read exactly as the adviser page's GSheetsConnection.read does, so the
+    # frames line up with what the sheet diff expects
+    return get_as_dataframe(get_worksheet(url, index), evaluate_formulas=True)
+
+def read_frame(source, url, index):
+    if source == SHEETS:
+        return _read_sheet(url, index)
+    if source.endswith(".parquet"):
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
+
+def write_frame(frame, target):
+    if target.endswith(".parquet"):
+        frame.to_parquet(target, index=False)
+    else:
+        frame.to_csv(target, index=False)
+    print(f"Wrote {len(frame)} rows to {target}.")
+
+def _row_hashes(resume_book):
+    return pd.Series(pd.util.hash_pandas_object(resume_book, index=False).values, index=resume_book['Email'].values)
+
+def print_diff(before, after, limit=20):
+    # who the run would remove, add or change, keyed by email
+    before = _row_hashes(postop_clean_resume_book(clean_resume_book(before.copy())))
+    after = _row_hashes(after)
+    before = before[~before.index.duplicated(keep='last')]
+    after = after[~after.index.duplicated(keep='last')]
+
+    common = before.index.intersection(after.index)
+    changes = {
+        "removed": before.index.difference(after.index),
+        "added": after.index.difference(before.index),
+        "changed": common[before[common].values != after[common].values],
+    }
+    for kind, emails in changes.items():
+        print(f"{len(emails)} {kind}")
+        for email in list(emails)[:limit]:
+            print(f"    {email}")
+        if len(emails) > limit:
+            print(f"    ... and {len(emails) - limit} more")
+
+def run(args):
+    request_types = [REQUEST_TYPES[t] for t in args.types]
+
+    with timed("batch: load requests"):
+        requests = read_frame(args.requests, REQUESTS_URL, 0)
+    with timed("batch: load resume book"):
+        resume_book = read_frame(args.resume_book, RESUME_BOOK_URL, 1)
+
+    pending = requests[(requests['Done?'] != 'yes') & requests['Timestamp'].notna()]
+    pending = pending[pending[REQUEST_TYPE_COL].isin(request_types)]
+    print(f"{len(pending)} pending requests, {len(resume_book)} resume book rows.")
+
+    with timed("batch: clean"):
+        pending = clean_requests(pending.copy())
+        new_book = clean_resume_book(resume_book.copy())
+    with timed("batch: apply requests"):
+        new_book = apply_requests(pending, new_book, request_types)
+    with timed("batch: postop clean"):
+        new_book = postop_clean_resume_book(new_book)
+
+    # the requests sheet keeps every row as submitted; handled rows are only marked done
+    new_requests = requests.copy()
+    new_requests['Done?'] = new_requests['Done?'].astype(object)
+    new_requests.loc[pending.index, 'Done?'] = 'yes'
+
+    if args.dry_run:
+        print_diff(resume_book, new_book)
+        if args.resume_book == SHEETS:
+            diff = sheet_diff_requests(0, resume_book, new_book)
+            print(f"Resume book sheet write: {'full rewrite' if diff is None else f'{len(diff)} batchUpdate requests'}.")
+        return
+
+    with timed("batch: write resume book"):
+        target = args.resume_book_out or args.resume_book
+        if target == SHEETS:
+            update_gs_resume_book(new_book, resume_book)
+            expire_resume_book_snapshot()
+        else:
+            write_frame(new_book, target)
+    with timed("batch: write requests"):
+        target = args.requests_out or args.requests
+        if target == SHEETS:
+            update_gs_requests(new_requests, requests)
+        else:
+            write_frame(new_requests, target)
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending resume book requests without the Streamlit app.")
+    parser.add_argument("--requests", default=SHEETS, help="'sheets' or a CSV/Parquet file of form responses")
+    parser.add_argument("--resume-book", default=SHEETS, help="'sheets' or a CSV/Parquet resume book file")
+    parser.add_argument("--requests-out", help="where to write the requests (defaults to --requests)")
+    parser.add_argument("--resume-book-out", help="where to write the resume book (defaults to --resume-book)")
+    parser.add_argument("--types", nargs="+", choices=list(REQUEST_TYPES), default=list(REQUEST_TYPES),
+                        help="request types to apply, always in remove, add, update order")
+    parser.add_argument("--dry-run", action="store_true", help="print what would change and write nothing")
+    args = parser.parse_args()
+
+    try:
+        with timed("batch: total"):
+            run(args)
+    finally:
+        # printed even when a stage fails, with the time it took to fail
+        print(stage_summary(session_timings()).round(3).to_string(index=False), flush=True)
+
+if __name__ == "__main__":
+    main()
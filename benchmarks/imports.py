@@ -0,0 +1,46 @@
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+
+# Cold-start cost of each entry point: its top-level imports, timed in a fresh
+# interpreter every run so nothing is already cached in sys.modules.
+
+ENTRY_POINTS = {
+    "recruiter page": "pages/recruiter.py",
+    "adviser page": "pages/adviser.py",
+    "batch runner": "batch_update.py",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+def top_level_imports(path):
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def time_imports(imports, repeat):
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", TIMER.format(imports=imports)],
+                                capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings), statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the imports each page and the batch runner start with.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, path in ENTRY_POINTS.items():
+        best, median = time_imports(top_level_imports(path), args.repeat)
+        print(f"{name:<32} best {best * 1000:10.1f} ms  median {median * 1000:10.1f} ms", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import contextlib
+import functools
+import io
+import json
+import statistics
+import time
+
+from app_utils import (add_all_requested, build_bm25_index, build_keyword_index, build_role_index, build_similarity_index, build_tfidf_model, clean_dfs,
+                       filter_resume_book, match_keywords, preprocess_series, rank_resumes, read_adviser_sheets, related_word_scores, remove_all_requested,
+                       similar_resumes, update_all_requested)
+from benchmarks.synthetic import QUARTERS, ROLES_COL, StandInConnection, make_requests, make_resume_book
+
+KEYWORDS = ["python", "computer", "visualization", "machine learning", "sql"]
+SHEET_LATENCY = 0.2
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        # the pipeline functions print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+class Fixtures:
+    # inputs the cases share, built on first use so a run limited with --only
+    # (say, the merge cases at 1M rows) never builds the text indexes
+    def __init__(self, resume_book, requests):
+        self.resume_book = resume_book
+        self.requests = requests
+
+    @functools.cached_property
+    def cleaned(self):
+        return clean_dfs(self.requests.copy(), self.resume_book.copy())
+
+    @property
+    def df(self):
+        return self.cleaned[0]
+
+    @property
+    def book(self):
+        return self.cleaned[1]
+
+    @functools.cached_property
+    def role_index(self):
+        return build_role_index(self.book[ROLES_COL])
+
+    @functools.cached_property
+    def filtered(self):
+        return filter_resume_book(self.book, (2025, 2027), QUARTERS, ["Data Science"], self.role_index)
+
+    @functools.cached_property
+    def keyword_index(self):
+        return build_keyword_index(self.book["Resume Full Text"])
+
+    @functools.cached_property
+    def model(self):
+        return build_tfidf_model(self.book["Resume Full Text"].dropna())
+
+    @functools.cached_property
+    def bm25_index(self):
+        return build_bm25_index(self.book["Resume Full Text"])
+
+    @functools.cached_property
+    def similarity_index(self):
+        return build_similarity_index(self.model, projection_dims=256)
+
+# each case takes the fixtures and returns the call to time; arguments are
+# bound with partial so fixtures are built before the clock starts
+CASES = {
+    "clean_dfs": lambda f: lambda: clean_dfs(f.requests.copy(), f.resume_book.copy()),
+    "add_all_requested": lambda f: functools.partial(add_all_requested, f.df, f.book),
+    "update_all_requested": lambda f: functools.partial(update_all_requested, f.df, f.book),
+    "remove_all_requested": lambda f: functools.partial(remove_all_requested, f.df, f.book),
+    "preprocess_series": lambda f: functools.partial(preprocess_series, f.book["Resume Full Text"].dropna()),
+    "analyze_cooccurrence (fit)": lambda f: functools.partial(build_tfidf_model, f.book["Resume Full Text"].dropna()),
+    "analyze_cooccurrence (query)": lambda f: functools.partial(related_word_scores, f.model, f.model["word_index"]["python"]),
+    "recruiter role index": lambda f: functools.partial(build_role_index, f.book[ROLES_COL]),
+    "recruiter filter": lambda f: functools.partial(filter_resume_book, f.book, (2025, 2027), QUARTERS, ["Data Science"], f.role_index),
+    "recruiter keyword index": lambda f: functools.partial(build_keyword_index, f.book["Resume Full Text"]),
+    "recruiter keyword match": lambda f: functools.partial(match_keywords, f.keyword_index, f.filtered.index, KEYWORDS),
+    "recruiter top-50 ranking": lambda f: functools.partial(rank_resumes, f.bm25_index, KEYWORDS, f.filtered.index, 50),
+    "recruiter similar (exact)": lambda f: functools.partial(
+        similar_resumes, f.similarity_index, f.model["row_ids"][0], f.filtered.index, 10, approximate=False),
+    "recruiter similar (projection)": lambda f: functools.partial(
+        similar_resumes, f.similarity_index, f.model["row_ids"][0], f.filtered.index, 10, approximate=True),
+    f"adviser sheet load (2 x {SHEET_LATENCY:g} s)": lambda f: lambda: read_adviser_sheets(
+        StandInConnection(f.requests, SHEET_LATENCY), StandInConnection(f.resume_book, SHEET_LATENCY)),
+}
+
+def run(sizes, request_ratio, repeat, only=None):
+    results = []
+    for size in sizes:
+        resume_book = make_resume_book(size)
+        requests = make_requests(resume_book, max(1, int(size * request_ratio)))
+        fixtures = Fixtures(resume_book, requests)
+        for name, case in CASES.items():
+            if only and not any(o in name for o in only):
+                continue
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = case(fixtures)
+            best, median = _time(fn, repeat)
+            results.append({"case": name, "size": size, "best": best, "median": median})
+            print(f"{name:<32} {size:>9,} rows  best {best * 1000:10.1f} ms  median {median * 1000:10.1f} ms", flush=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    # report cases that got slower than the baseline by more than tolerance
+    previous = {(r["case"], r["size"]): r["best"] for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get((r["case"], r["size"]))
+        if before and r["best"] > before * (1 + tolerance):
+            regressions.append(r)
+            print(f"REGRESSION {r['case']} at {r['size']:,} rows: {before * 1000:.1f} ms -> {r['best'] * 1000:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the resume book pipeline on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="resume book sizes to run (up to 1000000)")
+    parser.add_argument("--request-ratio", type=float, default=0.1, help="requests per resume book row")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only cases whose name contains one of these")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.request_ratio, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from app_utils import ADD_REQUEST, POSITION_COL, REMOVE_REQUEST, REQUEST_TYPE_COL, ROLES_COL, UPDATE_REQUEST
+
+BOOK_COLUMNS = ["First Name", "Last Name", "Email", "Grad Year", "Grad Quarter",
+                POSITION_COL, ROLES_COL, "Resume Full Text", "Upload Resume"]
+REQUEST_COLUMNS = ["Timestamp", "Email Address", "First Name", "Last Name", REQUEST_TYPE_COL, "Email ",
+                   "Grad Year", "Grad Quarter", POSITION_COL, ROLES_COL, "Resume Full Text", "Upload Resume", "Done?"]
+
+QUARTERS = ["Autumn", "Winter", "Spring", "Summer"]
+POSITIONS = ["Internship", "Full time", "Both"]
+ROLES = ["Software Development/Software Engineering", "Project Management", "Product Management",
+         "User Experience/User Interface", "Data Science", "Machine Learning", "Research", "Hardware"]
+
+SKILLS = ["python", "java", "c++", "javascript", "typescript", "sql", "react", "pandas", "pytorch",
+          "tensorflow", "docker", "kubernetes", "aws", "linux", "git", "figma", "tableau", "spark",
+          "visualization", "computer", "vision", "machine", "learning", "distributed", "systems",
+          "databases", "compilers", "security", "networks", "robotics", "graphics", "statistics"]
+FILLER = ["developed", "built", "designed", "led", "improved", "team", "project", "using", "data",
+          "research", "intern", "university", "washington", "software", "engineer", "analysis",
+          "tools", "pipeline", "students", "course", "teaching", "assistant", "award", "club"]
+
+# resume texts are stitched from a pool of random chunks so large books stay cheap to build;
+# past RESUME_POOL rows texts repeat, so a 1M-row book holds 50k strings, not 1M
+CHUNK_POOL = 5000
+CHUNK_WORDS = 40
+CHUNKS_PER_RESUME = 4
+RESUME_POOL = 50000
+
+def _chunk_pool(rng):
+    vocab = np.array(SKILLS + FILLER + [f"term{i}" for i in range(3000)])
+    weights = np.concatenate([np.full(len(SKILLS), 6.0), np.full(len(FILLER), 10.0), np.ones(3000)])
+    words = rng.choice(vocab, size=(CHUNK_POOL, CHUNK_WORDS), p=weights / weights.sum())
+    return np.array([" ".join(row) for row in words], dtype=object)
+
+def _resume_texts(rng, n):
+    pool = _chunk_pool(rng)
+    picks = rng.integers(0, CHUNK_POOL, size=(CHUNKS_PER_RESUME, min(n, RESUME_POOL)))
+    texts = pool[picks[0]]
+    for row in picks[1:]:
+        texts = texts + " " + pool[row]
+    if n > RESUME_POOL:
+        texts = texts[rng.integers(0, RESUME_POOL, size=n)]
+    return texts
+
+def _role_lists(rng, n):
+    combos = np.array([", ".join(sorted(rng.choice(ROLES, size=k, replace=False)))
+                       for k in (1, 1, 2, 2, 3) for _ in range(20)], dtype=object)
+    return combos[rng.integers(0, len(combos), size=n)]
+
+def _people(rng, n, offset=0):
+    ids = pd.Series(np.arange(offset, offset + n)).astype(str)
+    first = "first" + ids
+    last = "last" + ids
+    return first.values, last.values, (first + "." + last + "@uw.edu").values
+
+def make_resume_book(n, seed=0):
+    rng = np.random.default_rng(seed)
+    first, last, email = _people(rng, n)
+    return pd.DataFrame({
+        "First Name": first,
+        "Last Name": last,
+        "Email": email,
+        "Grad Year": rng.integers(2024, 2030, size=n),
+        "Grad Quarter": rng.choice(QUARTERS, size=n),
+        POSITION_COL: rng.choice(POSITIONS, size=n),
+        ROLES_COL: _role_lists(rng, n),
+        # object dtype keeps repeated texts as shared references (pandas 3 would copy them into one string buffer)
+        "Resume Full Text": pd.Series(_resume_texts(rng, n), dtype=object),
+        "Upload Resume": ("https://drive.google.com/open?id=resume" + pd.Series(np.arange(n)).astype(str)).values,
+    }, columns=BOOK_COLUMNS)
+
+def make_requests(resume_book, n, seed=1, mix=(0.4, 0.4, 0.2)):
+    # mix is the share of add, update and remove requests
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice([ADD_REQUEST, UPDATE_REQUEST, REMOVE_REQUEST], size=n, p=list(mix))
+    is_add = kinds == ADD_REQUEST
+
+    # adds are new students, updates and removals point at existing rows
+    existing = resume_book.iloc[rng.integers(0, len(resume_book), size=n)]
+    new_first, new_last, new_email = _people(rng, n, offset=len(resume_book))
+    first = np.where(is_add, new_first, existing["First Name"].values)
+    last = np.where(is_add, new_last, existing["Last Name"].values)
+    email = np.where(is_add, new_email, existing["Email"].values)
+
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=21)
+    timestamps = start + pd.to_timedelta(np.sort(rng.integers(0, 21 * 24 * 3600, size=n)), unit="s")
+
+    return pd.DataFrame({
+        "Timestamp": timestamps.strftime("%m/%d/%Y %H:%M:%S"),
+        "Email Address": email,
+        "First Name": first,
+        "Last Name": last,
+        REQUEST_TYPE_COL: kinds,
+        "Email ": email,
+        "Grad Year": rng.integers(2024, 2030, size=n),
+        "Grad Quarter": rng.choice(QUARTERS, size=n),
+        POSITION_COL: rng.choice(POSITIONS, size=n),
+        ROLES_COL: _role_lists(rng, n),
+        "Resume Full Text": _resume_texts(rng, n),
+        "Upload Resume": ("https://drive.google.com/open?id=request" + pd.Series(np.arange(n)).astype(str)).values,
+        "Done?": "",
+    }, columns=REQUEST_COLUMNS)
+
+class StandInConnection:
+    # answers like GSheetsConnection.read after a fixed network delay
+    def __init__(self, frame, latency):
+        self.frame = frame
+        self.latency = latency
+
+    def read(self, worksheet=None, ttl=None):
+        time.sleep(self.latency)
+        return self.frame.copy()
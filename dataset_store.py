@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Process-wide store for read-only datasets shared by every session. Sessions
+# keep references to these objects and must never modify them in place; a page
+# that needs to edit one works on its own copy (see pages/adviser.py).
+
+STORE_MAX_BYTES = 1024 ** 3
+VERSIONS_PER_NAME = 2
+
+_store = {}
+# reentrant: a dataset build may itself fetch another shared dataset
+_store_lock = threading.RLock()
+
+def _nbytes(data):
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    if isinstance(data, (pd.Series, pd.Index)):
+        return int(data.memory_usage(deep=True))
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if hasattr(data, 'nnz') and hasattr(data, 'indptr'):
+        # scipy sparse matrix
+        return data.data.nbytes + data.indices.nbytes + data.indptr.nbytes
+    if isinstance(data, dict):
+        return sys.getsizeof(data) + sum(_nbytes(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return sys.getsizeof(data) + sum(_nbytes(v) for v in data)
+    if isinstance(data, (set, frozenset)):
+        # members are row ids or words other parts of the index already hold
+        return sys.getsizeof(data)
+    if hasattr(data, '__dict__') and not callable(data):
+        # fitted models keep their vocabularies and weights as attributes
+        return sys.getsizeof(data) + _nbytes(vars(data))
+    return sys.getsizeof(data)
+
+def _evict():
+    # drop old versions of each dataset, then least recently used entries until
+    # under budget; the newest version of every dataset always stays
+    newest = {}
+    for (name, version), entry in _store.items():
+        if name not in newest or entry['created'] > _store[(name, newest[name])]['created']:
+            newest[name] = version
+
+    for name in newest:
+        versions = sorted((k for k in _store if k[0] == name), key=lambda k: _store[k]['created'], reverse=True)
+        for key in versions[VERSIONS_PER_NAME:]:
+            del _store[key]
+
+    evictable = sorted((k for k in _store if newest[k[0]] != k[1]), key=lambda k: _store[k]['last_used'])
+    while evictable and sum(e['nbytes'] for e in _store.values()) > STORE_MAX_BYTES:
+        del _store[evictable.pop(0)]
+
+def shared_dataset(name, version, build):
+    with _store_lock:
+        entry = _store.get((name, version))
+        if entry is None:
+            data = build()
+            now = time.time()
+            entry = {'data': data, 'nbytes': _nbytes(data), 'created': now, 'last_used': now}
+            _store[(name, version)] = entry
+            _evict()
+        entry['last_used'] = time.time()
+        return entry['data']
+
+def store_stats():
+    with _store_lock:
+        rows = [
+            {'Dataset': name, 'Version': str(version), 'MB': round(entry['nbytes'] / 1024 ** 2, 1),
+             'Idle (s)': round(time.time() - entry['last_used'])}
+            for (name, version), entry in _store.items()
+        ]
+    return pd.DataFrame(rows, columns=['Dataset', 'Version', 'MB', 'Idle (s)'])
@@ -0,0 +1,57 @@
+import streamlit as st
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+RESUME_BOOK_ID = '1xqvrDynnWfslrSnOymMtJCrMvmAQBka70L7i8USc5Bs'
+RESUME_BOOK_URL = 'https://docs.google.com/spreadsheets/d/1xqvrDynnWfslrSnOymMtJCrMvmAQBka70L7i8USc5Bs/edit?gid=0#gid=0'
+REQUESTS_URL = 'https://docs.google.com/spreadsheets/d/1IgOnbPhOoCRDBcTf9FIHwP54rHwcqSyKSJTE-XKNnJw/edit?gid=523778578#gid=523778578'
+
+# Everything below except the Sheets API service is created once per process
+# and shared by all sessions. Access tokens are fetched and refreshed lazily by
+# the authorized sessions the first time a request finds them missing or
+# expired. The Google client libraries are imported on first use so pages that
+# never talk to the API don't pay for them.
+
+@st.cache_resource(show_spinner=False)
+def get_credentials():
+    from google.oauth2.service_account import Credentials
+
+    try:
+        info = dict(st.secrets["google_service_account"])
+    except (KeyError, FileNotFoundError):
+        # local runs keep the service account in google_credentials.json
+        return Credentials.from_service_account_file("google_credentials.json", scopes=SCOPES)
+    return Credentials.from_service_account_info(info, scopes=SCOPES)
+
+@st.cache_resource(show_spinner=False)
+def get_client():
+    import gspread
+
+    return gspread.authorize(get_credentials())
+
+@st.cache_resource(show_spinner=False)
+def get_spreadsheet(url):
+    return get_client().open_by_url(url)
+
+@st.cache_resource(show_spinner=False)
+def get_worksheet(url, index):
+    return get_spreadsheet(url).get_worksheet(index)
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_discovery():
+    import json
+
+    from googleapiclient.discovery_cache import get_static_doc
+
+    return json.loads(get_static_doc('sheets', 'v4'))
+
+def get_sheets_service():
+    # not shared: the discovery client sends requests through httplib2, which is
+    # not thread-safe, and sessions run as threads. Building one from the cached
+    # document takes a few milliseconds.
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(get_sheets_discovery(), credentials=get_credentials())
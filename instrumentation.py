@@ -0,0 +1,84 @@
+import contextlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Stage timings, kept per Streamlit session. Work done outside a session (the
+# batch runner, background snapshot refreshes) is filed under "process".
+#
+#   @timed("merge: apply requests")
+#   def apply_requests(...): ...
+#
+#   with timed("sheets: read requests"):
+#       df = conn.read(...)
+
+MAX_SAMPLES = 2000
+MAX_SESSIONS = 50
+
+_timings = OrderedDict()
+_timings_lock = threading.Lock()
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else "process"
+
+def record(stage, seconds, session_id=None):
+    session_id = session_id or _session_id()
+    with _timings_lock:
+        samples = _timings.pop(session_id, None) or deque(maxlen=MAX_SAMPLES)
+        _timings[session_id] = samples
+        while len(_timings) > MAX_SESSIONS:
+            _timings.popitem(last=False)
+        samples.append((time.time(), stage, seconds))
+
+@contextlib.contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def session_timings(session_id=None):
+    with _timings_lock:
+        samples = list(_timings.get(session_id or _session_id(), ()))
+    timings = pd.DataFrame(samples, columns=["Time", "Stage", "Seconds"])
+    timings["Time"] = pd.to_datetime(timings["Time"], unit="s")
+    return timings
+
+def stage_summary(timings):
+    summary = timings.groupby("Stage")["Seconds"].describe(percentiles=[0.5, 0.95])
+    summary = summary.rename(columns={"count": "Calls", "mean": "Mean", "50%": "p50", "95%": "p95", "max": "Max"})
+    summary["Total"] = timings.groupby("Stage")["Seconds"].sum()
+    summary["Calls"] = summary["Calls"].astype(int)
+    return summary[["Calls", "Total", "Mean", "p50", "p95", "Max"]].sort_values("Total", ascending=False).reset_index()
+
+def timings_panel():
+    # shown when the page is opened with ?timings=1
+    if st.query_params.get("timings") != "1":
+        return
+
+    import plotly.express as px
+
+    with st.expander("Stage timings (this session)"):
+        timings = session_timings()
+        if timings.empty:
+            st.write("Nothing timed yet.")
+            return
+
+        st.dataframe(stage_summary(timings).round(4), hide_index=True)
+
+        stage = st.selectbox("Stage", sorted(timings["Stage"].unique()), key="timings_stage")
+        fig = px.histogram(timings[timings["Stage"] == stage], x="Seconds", nbins=30)
+        st.plotly_chart(fig, use_container_width=True)
+
+        export = timings.assign(Time=timings["Time"].astype(str))
+        st.download_button("Download timings (JSON)", json.dumps(export.to_dict(orient="records"), indent=2),
+                           file_name="timings.json", mime="application/json")
+        st.download_button("Download timings (CSV)", export.to_csv(index=False),
+                           file_name="timings.csv", mime="text/csv")
@@ -2,7 +2,9 @@ from streamlit_gsheets import GSheetsConnection
 import streamlit as st
 from PIL import Image
 import pandas as pd
-from app_utils import clean_dfs, postop_clean_resume_book, request_history, request_times, update_all_requested, add_all_requested, remove_all_requested, update_gs_requests, update_gs_resume_book
+from dataset_store import shared_dataset, store_stats
+from instrumentation import timed, timings_panel
+from app_utils import ADD_REQUEST, REMOVE_REQUEST, REQUEST_TYPE_COL, UPDATE_REQUEST, apply_requests, cached_near_duplicates, clean_requests, clean_resume_book, content_version, expire_resume_book_snapshot, load_adviser_sheets, postop_clean_resume_book, request_history, request_times, update_gs_requests, update_gs_resume_book, update_rollups
 
 st.markdown(
      f"""
@@ -76,14 +78,13 @@ st.markdown(
 
 # load data
 conn_one = st.connection("resume_book_reqs", type=GSheetsConnection)
-df_orig = conn_one.read(worksheet="Form Responses 1")
+conn_two = st.connection("resume_book", type=GSheetsConnection)
+df_orig, resume_book = load_adviser_sheets(conn_one, conn_two)
 df = df_orig[(df_orig['Done?'] != 'yes') & (df_orig['Timestamp'].notna())]
 
 if 'df' not in st.session_state:
     st.session_state['df'] = df
-
-conn_two = st.connection("resume_book", type=GSheetsConnection)
-resume_book = conn_two.read(worksheet="Resume Book")
+    st.session_state['requests_snapshot'] = df_orig.copy()
 
 
 # # load data old
@@ -97,10 +98,35 @@ resume_book = conn_two.read(worksheet="Resume Book")
 # csv_url = f"https://docs.google.com/spreadsheets/d/1xqvrDynnWfslrSnOymMtJCrMvmAQBka70L7i8USc5Bs/export?format=csv&gid=0"
 # resume_book = pd.read_csv(csv_url)
 
+# advisers share one cleaned copy of the book until they approve something;
+# approving works on a private copy so other sessions never see a half-applied book
 if 'resume_book' not in st.session_state:
-    st.session_state['resume_book'] = resume_book
-    
-st.session_state['df'], st.session_state['resume_book'] = clean_dfs(st.session_state['df'], st.session_state['resume_book'])
+    st.session_state['resume_book'] = shared_dataset('adviser_book', content_version(resume_book),
+                                                     lambda: clean_resume_book(resume_book.copy()))
+    st.session_state['resume_book_snapshot'] = resume_book
+
+st.session_state['df'] = clean_requests(st.session_state['df'])
+
+@timed("adviser: approve requests")
+def approve_requests(request_types):
+    df = st.session_state['df']
+    pending = df[(df['Done?'] != 'yes') & df[REQUEST_TYPE_COL].isin(request_types)]
+    resume_book = clean_resume_book(st.session_state['resume_book'].copy())
+    st.session_state['resume_book'] = apply_requests(pending, resume_book, request_types)
+
+    for value in request_types:
+        st.session_state['possible_values'][value] = 0
+    st.session_state['resume_book'] = postop_clean_resume_book(st.session_state['resume_book'])
+    update_gs_resume_book(st.session_state['resume_book'], st.session_state['resume_book_snapshot'])
+    # the recruiter overview counts for the new book, derived from the rows that changed
+    update_rollups(st.session_state['resume_book_snapshot'], st.session_state['resume_book'])
+    st.session_state['resume_book_snapshot'] = st.session_state['resume_book']
+    expire_resume_book_snapshot()
+
+    df.loc[pending.index, 'Done?'] = 'yes'
+    update_gs_requests(df, st.session_state['requests_snapshot'])
+    st.session_state['requests_snapshot'] = df.copy()
+    load_adviser_sheets.clear()
 
 with st.container():
     col1, col2 = st.columns([1.3, 3.5], vertical_alignment='top')
@@ -118,15 +144,16 @@ with st.container():
 
     if 'possible_values' not in st.session_state:    
         st.session_state['possible_values'] = {
-            "I already have a resume in this book and want to update it to a newer version or update my information in the survey.": 0,
-            "Add my first resume to this resume book": 0,
-            "I am no longer looking for a position and wish to remove my resume.": 0
+            UPDATE_REQUEST: 0,
+            ADD_REQUEST: 0,
+            REMOVE_REQUEST: 0
         }
 
-    value_counts = st.session_state['df']['Do you want to add, update, or remove your resume?'].value_counts().sort_index()
+    pending_df = st.session_state['df'][st.session_state['df']['Done?'] != 'yes']
+    value_counts = pending_df[REQUEST_TYPE_COL].value_counts().sort_index()
     
-    for value in value_counts.index:
-        st.session_state['possible_values'][value] = value_counts[value]
+    for value in st.session_state['possible_values']:
+        st.session_state['possible_values'][value] = value_counts.get(value, 0)
 
     col3, col4, col5 = st.columns([1, 1, 1])
     columns = [col3, col4, col5]
@@ -150,33 +177,39 @@ with st.container():
             if st.button(f"{i}) Approve requests"):
                 if st.session_state['possible_values'][value] == 0:
                     st.write('No requests to approve.')
-                else:               
-                    # st.write(f"before {len(st.session_state['resume_book'])}")    
-                    if value == list(st.session_state['possible_values'].keys())[0]:
-                        st.session_state['resume_book'] = update_all_requested(st.session_state['df'], st.session_state['resume_book'])
-                    elif value == list(st.session_state['possible_values'].keys())[1]:
-                        st.session_state['resume_book'] = add_all_requested(st.session_state['df'], st.session_state['resume_book'])
-                    elif value == list(st.session_state['possible_values'].keys())[2]:
-                        st.session_state['resume_book'] = remove_all_requested(st.session_state['df'], st.session_state['resume_book'])
-                    else:
-                        raise KeyError(f"{value} does not match any values: {st.session_state['possible_values'].keys()}.")
-                    
-                    st.session_state['possible_values'][value] = 0
-                    st.session_state['resume_book'] = postop_clean_resume_book(st.session_state['resume_book'])
-                    update_gs_resume_book(st.session_state['resume_book'])
-                    
-                    
-                    st.session_state['df'].loc[st.session_state['df']['Do you want to add, update, or remove your resume?'] == value, 'Done?'] = 'yes'
-                    update_gs_requests(st.session_state['df'])
-                    
-                    # st.write(f"after: {len(st.session_state['resume_book'])}")
+                else:
+                    approve_requests([value])
                     st.write(f"Requests approved.")
-                    
+
+    pending_types = [value for value in values if st.session_state['possible_values'][value] > 0]
+    if st.button("Approve all requests"):
+        if not pending_types:
+            st.write('No requests to approve.')
+        else:
+            # removals, adds, then updates in one pass, with one write per sheet
+            approve_requests(pending_types)
+            st.write(f"All requests approved.")
                        
     st.markdown('<hr class="custom-divider" style="border-top: 2px solid lightblue">', unsafe_allow_html=True)
     
     df_time = df_orig
     df_time['Timestamp'] = pd.to_datetime(df_orig['Timestamp'], errors='coerce')
     # st.write(df_time)
-    st.pyplot(request_history(df_time))
-    st.pyplot(request_times(df_time))
\ No newline at end of file
+    with timed("chart: draw request charts"):
+        st.pyplot(request_history(df_time))
+        st.pyplot(request_times(df_time))
+
+    # rows the exact email/name matching treats as different students but probably aren't
+    with st.expander("Possible duplicate students"):
+        identity = st.session_state['resume_book'][['First Name', 'Last Name', 'Email']]
+        duplicates = cached_near_duplicates(content_version(identity), identity)
+        if duplicates.empty:
+            st.write("No likely duplicates found.")
+        else:
+            st.write(f"{len(duplicates)} pairs of rows look like the same student. Rows are numbered as in the sheet.")
+            st.dataframe(duplicates, hide_index=True)
+
+    with st.expander("Shared data in memory"):
+        st.dataframe(store_stats(), hide_index=True)
+
+timings_panel()
@@ -1,14 +1,9 @@
     
 from datetime import datetime
-import re
-from matplotlib import pyplot as plt
 import streamlit as st
 from PIL import Image
-import pandas as pd
-import plotly.express as px
-import plotly.colors as pc
-from app_utils import analyze_cooccurrence, generate_shades, parse_rgb_string, preprocess_text
-from wordcloud import WordCloud, STOPWORDS
+from instrumentation import timed, timings_panel
+from app_utils import analyze_cooccurrence, cached_bm25_index, cached_export_csv, cached_keyword_index, cached_similarity_index, cached_wordcloud_png, filter_resume_book, match_keywords, position_figure, preprocess_text, quarter_figure, rank_resumes, recruiter_dataset, role_figure, rollup_role_counts, rollup_years, similar_resumes, year_figure
 
 st.markdown(
      f"""
@@ -108,9 +103,12 @@ st.markdown(
  )
 
 # load data
-if 'resume_book' not in st.session_state:
-    csv_url = f"https://docs.google.com/spreadsheets/d/1xqvrDynnWfslrSnOymMtJCrMvmAQBka70L7i8USc5Bs/export?format=csv&gid=0"
-    st.session_state['resume_book'] = pd.read_csv(csv_url)
+# the compact book is shared by every session; sessions only keep references to it
+with timed("recruiter: load dataset"):
+    dataset = recruiter_dataset()
+resume_book, role_index = dataset['book'], dataset['role_index']
+st.session_state['resume_book_version'] = dataset['version']
+st.session_state['text_series'] = dataset['text_series']
 
 with st.container():
     col1, col2 = st.columns([1.3, 3.5], vertical_alignment='top')
@@ -142,176 +140,43 @@ with st.container():
             </div>
             ''')
     
-    # st.write( st.session_state['resume_book'].head())
+    # st.write( resume_book.head())
     st.subheader("Graduation Overview", divider='violet')
 
     current_year = datetime.now().year
 
-    year_counts =  st.session_state['resume_book']['Grad Year'].value_counts().reset_index()
-    year_counts.columns = ['Grad Year', 'Count']
-
-    base_colors = px.colors.qualitative.Prism_r
-    year_color_map = {year: base_colors[i % len(base_colors)] for i, year in enumerate(sorted(year_counts['Grad Year']))}
+    # counts and figure specs are built once per resume-book version
+    rollups, rollup_version = dataset['rollups'], dataset['rollup_version']
+    years = rollup_years(rollups)
 
     col1, col2 = st.columns([9, 5])
 
     with col1:
         st.subheader("Graduation Year")
-        fig = px.pie(
-            year_counts,
-            names='Grad Year',
-            values='Count',
-            color='Grad Year',
-            color_discrete_map=year_color_map,
-            hole=0.3,
-            height=490
-        )
-        fig.update_traces(textinfo='label+percent', hoverinfo='label+value+percent')
-        fig.update_layout(
-            legend=dict(orientation="h", x=0.5, xanchor="center", y=-0.1),
-            margin=dict(t=40, b=40, l=0, r=0)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(year_figure(rollup_version, rollups), use_container_width=True)
 
     with col2:
         selected_year = st.selectbox(
             "Select a Grad Year to see breakdown",
-            sorted(st.session_state['resume_book']['Grad Year'].dropna().unique()),
-            index=list(st.session_state['resume_book']['Grad Year'].dropna().unique()).index(current_year)  # Default to current year
-        )
-        quarter_counts = st.session_state['resume_book'][
-            st.session_state['resume_book']['Grad Year'] == selected_year
-        ]['Grad Quarter'].value_counts().reset_index()
-        quarter_counts.columns = ['Grad Quarter', 'Count']
-
-        base_color = year_color_map.get(selected_year, "#636EFA")
-        if base_color.startswith("rgb"):
-            base_rgb = parse_rgb_string(base_color)
-        else:
-            base_rgb = pc.hex_to_rgb(base_color)
-
-        lightness_scale = [0.4 + 0.5 * (i / max(1, len(quarter_counts) - 1)) for i in range(len(quarter_counts))]
-        quarter_colors = [
-            pc.label_rgb(tuple(min(int(c * l), 255) for c in base_rgb))
-            for l in lightness_scale
-        ]
-        quarter_color_map = dict(zip(quarter_counts['Grad Quarter'], quarter_colors))
-
-        fig_quarter = px.pie(
-            quarter_counts,
-            names='Grad Quarter',
-            values='Count',
-            color='Grad Quarter',
-            color_discrete_map=quarter_color_map,
-            hole=0.3,
-            title=f'Quarterly Breakdown for {selected_year}',
-        )
-        fig_quarter.update_traces(textinfo='label+percent', hoverinfo='label+value+percent',
-                                  domain={'x': [0.1, 0.9], 'y': [0.1, 0.9]})
-        fig_quarter.update_layout(
-            legend=dict(orientation="h", x=0.5, xanchor="center", y=-0.1),
-            margin=dict(t=40, b=40)
+            years,
+            index=years.index(current_year) if current_year in years else 0  # Default to current year
         )
-        st.plotly_chart(fig_quarter, use_container_width=True)
+        st.plotly_chart(quarter_figure(rollup_version, selected_year, rollups), use_container_width=True)
         
     st.subheader("Desired Positions", divider='violet')
 
     st.subheader("Position Preference")
-    position_counts = st.session_state['resume_book']["Are you looking for an internship or full-time position?"].value_counts().reset_index()
-    position_counts.columns = ["Position Type", "Count"]
-
-    desired_order = ["Internship", "Full time", "Both"]
-    position_counts["Position Type"] = pd.Categorical(position_counts["Position Type"], categories=desired_order, ordered=True)
-    position_counts = position_counts.sort_values("Position Type")
-    
-    base_color = "#7451c1" 
-    num_positions = len(position_counts)
-    custom_colors = generate_shades(base_color, num_positions)
-
-    fig_position = px.bar(
-        position_counts,
-        x="Count",
-        y="Position Type",
-        text="Count",
-        color="Position Type",
-        orientation='h',
-        height=200,
-        color_discrete_sequence = custom_colors
-    )
-
-    fig_position.update_layout(
-        showlegend=False,
-        xaxis_title="Number of Students",
-        yaxis_title="",
-        margin=dict(t=40, b=40)
-    )
-
-    fig_position.update_traces(textposition='outside')
-    st.plotly_chart(fig_position, use_container_width=True)
+    st.plotly_chart(position_figure(rollup_version, rollups), use_container_width=True)
 
     st.subheader("Preferred Roles")
-    role_series = st.session_state['resume_book']["What types of roles are you looking for?"].dropna()
-    all_roles = role_series.str.split(", ").explode()
-    all_roles = all_roles[all_roles != ""]
-
-    role_counts = all_roles.value_counts().reset_index()
-    role_counts.columns = ["Role", "Count"]
-    
+    role_counts = rollup_role_counts(rollups)
     role_counts = role_counts[role_counts["Count"] >= 2]
-
-    max_count = role_counts["Count"].max()
-    min_count = role_counts["Count"].min()
-    use_log_x = (max_count - min_count) > 50
-
-    base_color = "#1f77b4" 
-    num_roles = len(role_counts)
-    custom_colors = generate_shades(base_color, num_roles)
-
-    fig_roles = px.bar(
-        role_counts,
-        x="Count",
-        y="Role",
-        text="Count",
-        color="Role",
-        orientation="h",
-        color_discrete_sequence = custom_colors
-    )
-
-    fig_roles.update_layout(
-        showlegend=False,
-        xaxis_title="Number of Students",
-        yaxis_title="",
-        margin=dict(t=40, b=40),
-        xaxis_type="log" if use_log_x else "linear"
-    )
-
-    fig_roles.update_traces(textposition='outside')
-
-    st.plotly_chart(fig_roles, use_container_width=True)
+    st.plotly_chart(role_figure(rollup_version, rollups), use_container_width=True)
     
     st.subheader("Resume Keywords", divider='violet')
     
-    if 'text_series' not in st.session_state:
-        st.session_state['text_series'] = st.session_state['resume_book']['Resume Full Text'].dropna()
-    full_text = " ".join(st.session_state['text_series'])
-
-    full_text = re.sub(r'\d+', '', full_text)
-
-    stopwords = STOPWORDS
-
-    if 'wordcloud' not in st.session_state:
-        st.session_state['wordcloud'] = WordCloud(
-            width=800,
-            height=400,
-            background_color='white',
-            stopwords=stopwords,
-            collocations=False
-        ).generate(full_text)
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(st.session_state['wordcloud'], interpolation='bilinear')
-    ax.axis("off")
-    st.pyplot(fig)
+    with timed("chart: draw word cloud"):
+        st.image(cached_wordcloud_png(st.session_state['resume_book_version'], st.session_state['text_series']), use_column_width=True)
     
     user_input = st.text_input("Enter a word to analyze:")
     if user_input:
@@ -324,8 +189,8 @@ with st.container():
         
     st.subheader("Resume Filter Tool", divider='violet')
 
-    QUARTERS = st.session_state['resume_book']['Grad Quarter'].dropna().unique()
-    YEARS = st.session_state['resume_book']['Grad Year'].dropna().unique()
+    QUARTERS = list(resume_book['Grad Quarter'].dropna().unique())
+    YEARS = resume_book['Grad Year'].dropna().unique()
     
     min_year = int(YEARS.min())
     max_year = int(YEARS.max())
@@ -350,13 +215,7 @@ with st.container():
         if keyword:
             keywords.append(keyword.lower())
         # --- Filter logic ---
-    filtered_df = st.session_state['resume_book'][
-        (st.session_state['resume_book']["Grad Year"] >= grad_year_range[0]) &
-        (st.session_state['resume_book']["Grad Year"] <= grad_year_range[1]) &
-        (st.session_state['resume_book']["Grad Quarter"].isin(quarter_options)) &
-        (st.session_state['resume_book']["What types of roles are you looking for?"]
-            .apply(lambda r: isinstance(r, str) and any(role in r for role in selected_roles)))
-    ]
+    filtered_df = filter_resume_book(resume_book, grad_year_range, quarter_options, selected_roles, role_index)
     
     filtered_df['Resume Full Text'] = filtered_df['Resume Full Text'].astype(str)
 
@@ -364,12 +223,8 @@ with st.container():
 
     st.write(f"Total resumes matching requirements (ignoring keywords): {len(filtered_df)}")
 
-    def keyword_match(row, keywords):
-        text = row["Resume Full Text"].lower()
-        matches = [kw for kw in keywords if kw in text]
-        return matches
-
-    filtered_df["matched_keywords"] = filtered_df.apply(lambda row: keyword_match(row, keywords), axis=1)
+    keyword_index = cached_keyword_index(st.session_state['resume_book_version'], resume_book['Resume Full Text'])
+    filtered_df["matched_keywords"] = match_keywords(keyword_index, filtered_df.index, keywords)
     filtered_df["match_count"] = filtered_df["matched_keywords"].apply(len)
     max_match = filtered_df["match_count"].max() if not filtered_df.empty else 0
 
@@ -383,30 +238,74 @@ with st.container():
         st.write(f"{len(partial_matches)} resumes matched at least one keyword.")
         st.write(f"The most matched keywords in a resume was {max_match}.")
 
+    st.subheader("Top Candidates")
+    top_k = st.number_input("How many top-ranked resumes to show?", value=50, min_value=1, step=1)
+    bm25_index = cached_bm25_index(st.session_state['resume_book_version'], resume_book['Resume Full Text'])
+    keyword_matches = filtered_df[filtered_df["match_count"] > 0]
+    ranked = rank_resumes(bm25_index, keywords, keyword_matches.index, int(top_k))
+    if len(ranked) < top_k:
+        # the keyword filter also matches inside longer words (python in python3),
+        # which the ranking has no term for; list those after, by keyword matches
+        unranked = keyword_matches.loc[~keyword_matches.index.isin([row_id for row_id, _ in ranked]), "match_count"]
+        unranked = unranked.sort_values(ascending=False, kind='stable').head(int(top_k) - len(ranked))
+        ranked += [(row_id, 0.0) for row_id in unranked.index]
+    if ranked:
+        top_df = filtered_df.loc[[row_id for row_id, _ in ranked]]
+        top_df.insert(0, "Score", [round(score, 2) for _, score in ranked])
+        st.dataframe(top_df[["Score", "First Name", "Last Name", "Email", "Grad Year", "Grad Quarter", "matched_keywords"]], hide_index=True)
+    else:
+        st.write("No resumes contain any of the keywords.")
+
+    st.subheader("More Like This")
+    # top-ranked candidates first, then everyone else who meets the requirements
+    with_text = filtered_df.index.intersection(st.session_state['text_series'].index)
+    choices = list(dict.fromkeys([row_id for row_id, _ in ranked if row_id in with_text] + list(with_text)))
+    chosen = st.selectbox(
+        "Find resumes similar to",
+        choices,
+        index=None,
+        format_func=lambda row_id: f"{filtered_df.at[row_id, 'First Name']} {filtered_df.at[row_id, 'Last Name']} ({filtered_df.at[row_id, 'Email']})",
+        placeholder="Choose a student"
+    )
+    if chosen is not None:
+        num_similar = st.number_input("How many similar resumes to show?", value=10, min_value=1, step=1)
+        similarity_index = cached_similarity_index(st.session_state['resume_book_version'], st.session_state['text_series'])
+        similar = similar_resumes(similarity_index, chosen, filtered_df.index, int(num_similar))
+        if similar:
+            similar_df = filtered_df.loc[[row_id for row_id, _ in similar]]
+            similar_df.insert(0, "Similarity", [round(score, 2) for _, score in similar])
+            st.dataframe(similar_df[["Similarity", "First Name", "Last Name", "Email", "Grad Year", "Grad Quarter", "matched_keywords"]], hide_index=True)
+        else:
+            st.write("No other resumes meet the requirements.")
+
     min_required = st.slider("Set minimum number of keyword matches to download resumes", min_value=1, max_value=max(2, len(keywords)), value=2)
 
     st.subheader("Download Resume Sets")
         
-    csv = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="Download resumes (Requirements only)",
-        data=csv,
-        file_name='requirements_only.csv',
-        mime='text/csv'
-    )
-    
-    csv2 = filtered_df[filtered_df["match_count"] >= min_required].to_csv(index=False)
-    st.download_button(
-        label=f"Download resumes (≥ {min_required} keyword matches)",
-        data=csv2,
-        file_name=f'min_{min_required}_matches.csv',
-        mime='text/csv'
-    )
-    
-    csv3 = exact_matches.to_csv(index=False)
-    st.download_button(
-        label="Download resumes (All keyword matches)",
-        data=csv3,
-        file_name=f'all_keywords_matched.csv',
-        mime='text/csv'
-    )
\ No newline at end of file
+    # CSVs are only built once a set is requested, then reused while the book and filters stay the same;
+    # keyed on the whole book, since an export also carries names, emails and grad years
+    filter_signature = (dataset['book_version'], grad_year_range, tuple(quarter_options), tuple(selected_roles), tuple(keywords))
+    export_sets = [
+        ("requirements_only", "Download resumes (Requirements only)", 'requirements_only.csv',
+            lambda: filtered_df),
+        ("min_matches", f"Download resumes (≥ {min_required} keyword matches)", f'min_{min_required}_matches.csv',
+            lambda: filtered_df[filtered_df["match_count"] >= min_required]),
+        ("all_keywords", "Download resumes (All keyword matches)", 'all_keywords_matched.csv',
+            lambda: exact_matches),
+    ]
+
+    for kind, label, file_name, make_frame in export_sets:
+        signature = filter_signature + (kind, min_required)
+        if st.session_state.get(f"export_{kind}") != signature:
+            if st.button(f"Prepare: {label}", key=f"prepare_{kind}"):
+                st.session_state[f"export_{kind}"] = signature
+
+        if st.session_state.get(f"export_{kind}") == signature:
+            st.download_button(
+                label=label,
+                data=cached_export_csv(signature, make_frame),
+                file_name=file_name,
+                mime='text/csv'
+            )
+
+timings_panel()
@@ -0,0 +1,26 @@
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+from app_utils.aggregates import _rollup_rows, build_rollups, update_rollups
+from app_utils.merge import ADD_REQUEST, REMOVE_REQUEST, UPDATE_REQUEST, apply_requests, clean_dfs, postop_clean_resume_book
+from benchmarks.synthetic import make_requests, make_resume_book
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("request_types", [
+    (REMOVE_REQUEST, ADD_REQUEST, UPDATE_REQUEST),
+    (UPDATE_REQUEST,),
+    (REMOVE_REQUEST,),
+])
+def test_updated_rollups_match_a_rebuild(seed, request_types):
+    book = make_resume_book(200, seed=seed)
+    requests, old_book = clean_dfs(make_requests(book, 40, seed=seed + 100), book)
+    with contextlib.redirect_stdout(io.StringIO()):
+        new_book = postop_clean_resume_book(apply_requests(requests, old_book.copy(), request_types))
+        _, updated = update_rollups(old_book, new_book)
+        rebuilt = build_rollups(_rollup_rows(new_book))
+
+    for key in ["years", "quarters", "positions", "roles"]:
+        pd.testing.assert_series_equal(updated[key].sort_index(), rebuilt[key].sort_index(), obj=key)
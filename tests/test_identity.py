@@ -0,0 +1,38 @@
+import pandas as pd
+
+from app_utils.identity import find_near_duplicates, soundex
+
+def _book(rows):
+    return pd.DataFrame(rows, columns=["First Name", "Last Name", "Email"])
+
+def _pairs(book):
+    duplicates = find_near_duplicates(book)
+    return {(row, other): why for row, other, why in duplicates[["Row", "Other Row", "Why"]].itertuples(index=False)}
+
+def test_soundex():
+    assert [soundex(name) for name in ["robert", "rupert", "ashcraft", "tymczak", "pfister"]] == \
+        ["r163", "r163", "a261", "t522", "p236"]
+
+def test_finds_typos_swaps_and_shared_emails():
+    book = _book([
+        ["jonathan", "smith", "jsmith@uw.edu"],
+        ["jonathon", "smith", "jonsmith2@gmail.com"],
+        ["smith", "jonathan", "js@uw.edu"],
+        ["xi", "li", "xli@uw.edu"],
+        ["bo", "li", "xli@uw.edu"],
+        ["maria", "garcia", "mgarcia@uw.edu"],
+        ["mariah", "garcia", "mgarcia@gmail.com"],
+    ])
+    pairs = _pairs(book)
+    assert pairs[(2, 3)] == "similar name"
+    assert pairs[(2, 4)] == "first/last swapped"
+    assert pairs[(5, 6)] == "same email"
+    assert pairs[(7, 8)] == "same email username, similar name"
+
+def test_netids_differing_by_digits_are_different_students():
+    book = _book([["jane", "doe", "jdoe@uw.edu"], ["john", "doe", "jdoe2@uw.edu"]])
+    assert _pairs(book) == {}
+
+def test_missing_values_are_not_duplicates():
+    book = _book([[None, "lee", None], [None, "lee", None], ["ann", None, "nan"]])
+    assert _pairs(book) == {}
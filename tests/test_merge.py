@@ -0,0 +1,141 @@
+import contextlib
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from app_utils.merge import ADD_REQUEST, REMOVE_REQUEST, REQUEST_TYPE_COL, UPDATE_REQUEST, apply_requests, clean_dfs
+from benchmarks.synthetic import BOOK_COLUMNS, REQUEST_COLUMNS
+
+# the row-by-row add and update functions apply_requests replaced, kept as the
+# reference for which rows survive
+
+def old_update_all_requested(df, resume_book):
+    df_update_cols = df.loc[:, "First Name":"Upload Resume"].columns.tolist()
+    df_update_cols = [col for col in df_update_cols if col != REQUEST_TYPE_COL]
+
+    update_rows = df[df[REQUEST_TYPE_COL] == UPDATE_REQUEST]
+    update_rows = update_rows.drop_duplicates(subset=["Email "], keep="last")
+    update_rows = update_rows.drop_duplicates(subset=["First Name", "Last Name"], keep="last")
+
+    update_rows_new = update_rows[df_update_cols]
+    update_rows_new.columns = resume_book.columns
+    resume_book = pd.concat([resume_book, update_rows_new], ignore_index=True)
+
+    for index, row in update_rows.iterrows():
+        email = row["Email "]
+        email2 = row['Email Address']
+        matching_rows = resume_book[(resume_book["Email"] == email) | (resume_book["Email"] == email2)]
+        if len(matching_rows) > 1:
+            later_matching_row_index = matching_rows.index.max()
+            resume_book = resume_book.drop(matching_rows.index[matching_rows.index != later_matching_row_index])
+
+        matching_rows = resume_book[(resume_book["First Name"] == row['First Name']) & (resume_book["Last Name"] == row['Last Name'])]
+        if len(matching_rows) > 1:
+            later_matching_row_index = matching_rows.index.max()
+            resume_book = resume_book.drop(matching_rows.index[matching_rows.index != later_matching_row_index])
+    return resume_book
+
+def old_add_all_requested(df, resume_book):
+    df_update_cols = df.loc[:, "First Name":"Upload Resume"].columns.tolist()
+    df_update_cols = [col for col in df_update_cols if col != REQUEST_TYPE_COL]
+
+    add_rows = df[df[REQUEST_TYPE_COL] == ADD_REQUEST][df_update_cols]
+    add_rows.columns = resume_book.columns
+    return pd.concat([resume_book, add_rows], ignore_index=True)
+
+def _book_row(first, last, email, i):
+    return [first, last, email, 2025, "Autumn", "Both", "Data Science", f"resume {i}", f"url {i}"]
+
+def _request(kind, first, last, email, email2=None, i=0):
+    return [f"1/{i % 28 + 1}/2024 10:00:00", email2 or email, first, last, kind, email,
+            2026, "Spring", "Internship", "Research", f"new resume {i}", f"new url {i}", ""]
+
+def _frames(book_rows, request_rows):
+    book = pd.DataFrame(book_rows, columns=BOOK_COLUMNS)
+    requests = pd.DataFrame(request_rows, columns=REQUEST_COLUMNS)
+    return clean_dfs(requests, book)
+
+def _apply(requests, book, kinds):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return apply_requests(requests, book.copy(), kinds)
+
+def _random_case(rng, people, emails, kinds):
+    book = [_book_row(rng.choice(people[0]), rng.choice(people[1]), rng.choice(emails), i)
+            for i in range(rng.randint(0, 15))]
+    requests = [_request(rng.choice(kinds), rng.choice(people[0]), rng.choice(people[1]),
+                         rng.choice(emails), rng.choice(emails), i)
+                for i in range(rng.randint(1, 6))]
+    return _frames(book, requests)
+
+@pytest.mark.parametrize("pool", [
+    # realistic: most students distinct, a few shared names and reused emails
+    (40, 40, 60),
+    # adversarial: several updates share emails and names with each other and the book
+    (3, 3, 5),
+])
+def test_updates_match_old_loop(pool):
+    rng = random.Random(sum(pool))
+    people = ([f"first{i}" for i in range(pool[0])], [f"last{i}" for i in range(pool[1])])
+    emails = [f"user{i}@uw.edu" for i in range(pool[2])]
+    for trial in range(300):
+        requests, book = _random_case(rng, people, emails, [UPDATE_REQUEST, ADD_REQUEST])
+        expected = old_update_all_requested(requests, book.copy())
+        pd.testing.assert_frame_equal(_apply(requests, book, [UPDATE_REQUEST]), expected, obj=f"trial {trial}")
+
+def test_adds_match_old_concat():
+    rng = random.Random(1)
+    people = (["ann", "bo"], ["lee", "kim"])
+    for trial in range(50):
+        requests, book = _random_case(rng, people, ["a@uw.edu", "b@uw.edu"], [ADD_REQUEST, UPDATE_REQUEST])
+        expected = old_add_all_requested(requests, book.copy())
+        pd.testing.assert_frame_equal(_apply(requests, book, [ADD_REQUEST]), expected, obj=f"trial {trial}")
+
+def test_update_keeps_latest_row_for_shared_email():
+    requests, book = _frames(
+        [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("bo", "kim", "bo@uw.edu", 1)],
+        [_request(UPDATE_REQUEST, "ann", "lee", "ann@uw.edu", i=1),
+         _request(UPDATE_REQUEST, "ann", "lee", "ann@uw.edu", i=2)],
+    )
+    result = _apply(requests, book, [UPDATE_REQUEST])
+    assert result["Email"].tolist() == ["bo@uw.edu", "ann@uw.edu"]
+    assert result["Resume Full Text"].tolist() == ["resume 1", "new resume 2"]
+
+# removals: a row goes when its email is either of the request's emails; only
+# requests matching no email fall back to the name, and only to a unique exact match
+
+def _removed(book_rows, request_rows):
+    requests, book = _frames(book_rows, request_rows)
+    result = _apply(requests, book, [REMOVE_REQUEST])
+    return sorted(set(book["Resume Full Text"]) - set(result["Resume Full Text"]))
+
+def test_remove_by_either_email():
+    book = [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("ann", "lee", "ann@gmail.com", 1),
+            _book_row("bo", "kim", "bo@uw.edu", 2)]
+    assert _removed(book, [_request(REMOVE_REQUEST, "ann", "lee", "ann@uw.edu", "ann@gmail.com")]) == ["resume 0", "resume 1"]
+    assert _removed(book, [_request(REMOVE_REQUEST, "x", "y", "nobody@uw.edu", "bo@uw.edu")]) == ["resume 2"]
+
+def test_remove_deletes_every_row_with_the_email():
+    book = [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("anne", "lee", "ann@uw.edu", 1)]
+    assert _removed(book, [_request(REMOVE_REQUEST, "ann", "lee", "ann@uw.edu")]) == ["resume 0", "resume 1"]
+
+def test_remove_falls_back_to_unique_exact_name():
+    book = [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("ann", "kim", "annk@uw.edu", 1),
+            _book_row("bo", "lee", "bo@uw.edu", 2)]
+    assert _removed(book, [_request(REMOVE_REQUEST, "Ann", "Lee", "ann.lee@gmail.com")]) == ["resume 0"]
+
+def test_remove_by_name_aborts_when_ambiguous():
+    book = [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("ann", "lee", "ann2@uw.edu", 1)]
+    assert _removed(book, [_request(REMOVE_REQUEST, "ann", "lee", "ann.lee@gmail.com")]) == []
+
+def test_remove_by_name_skipped_when_email_matched():
+    # the email match decides; the name is not used to remove anyone else
+    book = [_book_row("ann", "lee", "ann@uw.edu", 0), _book_row("ann", "lee", "other@uw.edu", 1)]
+    assert _removed(book, [_request(REMOVE_REQUEST, "ann", "lee", "ann@uw.edu")]) == ["resume 0"]
+
+def test_remove_without_email_raises():
+    requests, book = _frames([_book_row("ann", "lee", "ann@uw.edu", 0)],
+                             [_request(REMOVE_REQUEST, "ann", "lee", "")])
+    with pytest.raises(ValueError):
+        _apply(requests, book, [REMOVE_REQUEST])
@@ -0,0 +1,60 @@
+import contextlib
+import io
+
+from app_utils import recruiter
+from app_utils.snapshot import _download_snapshot, expire_resume_book_snapshot, snapshot_signature
+from benchmarks.synthetic import make_resume_book
+
+def test_expired_snapshot_never_serves_an_older_book(tmp_path, monkeypatch):
+    sheet, path = tmp_path / "book.csv", str(tmp_path / "book.parquet")
+    monkeypatch.setattr(recruiter, "SNAPSHOT_PATH", path)
+    monkeypatch.setattr(recruiter, "ensure_resume_book_snapshot", lambda: snapshot_signature(path))
+    monkeypatch.setattr(recruiter, "_snapshot_versions", {})
+
+    def publish(n_rows):
+        make_resume_book(n_rows).to_csv(sheet, index=False)
+        _download_snapshot(str(sheet), path)
+
+    def served():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return len(recruiter.recruiter_dataset()['book'])
+
+    publish(30)
+    assert served() == 30
+    expire_resume_book_snapshot(path)
+    assert served() == 30
+    publish(29)
+    assert served() == 29
+    # a second approval expires the refreshed copy; it stays up until the next refresh
+    expire_resume_book_snapshot(path)
+    assert served() == 29
+    publish(28)
+    assert served() == 28
+
+def _roles_book(role_lists):
+    book = make_resume_book(len(role_lists))
+    book[recruiter.ROLES_COL] = role_lists
+    return book
+
+def test_roles_match_whole_names_only():
+    book = _roles_book(["Research", "Data Science Research", "Data Science, Research", None])
+    index = recruiter.build_role_index(book[recruiter.ROLES_COL])
+    assert recruiter.role_rows(index, ["Research"]).tolist() == [True, False, True, False]
+    assert recruiter.role_rows(index, ["Data Science"]).tolist() == [False, False, True, False]
+    assert recruiter.role_rows(index, ["Data Science Research"]).tolist() == [False, True, False, False]
+
+def test_roles_are_trimmed_and_casefolded():
+    book = _roles_book(["  Data Science ", "data science,Hardware", "Data  Science", "Data Science", "Hardware"])
+    index = recruiter.build_role_index(book[recruiter.ROLES_COL])
+    # most picked first, each under its most common spelling
+    assert index['roles'] == ["Data Science", "Hardware"]
+    assert recruiter.role_rows(index, ["DATA SCIENCE"]).tolist() == [True, True, True, True, False]
+    assert recruiter.role_rows(index, [" hardware"]).tolist() == [False, True, False, False, True]
+
+def test_filter_resume_book_uses_role_index():
+    book = _roles_book(["Research", "Data Science Research", "research", "Hardware"])
+    book["Grad Year"], book["Grad Quarter"] = [2025, 2025, 2027, 2025], "Autumn"
+    compact, index = recruiter.compact_resume_book(book)
+    with contextlib.redirect_stdout(io.StringIO()):
+        filtered = recruiter.filter_resume_book(compact, (2024, 2026), ["Autumn"], ["Research"], index)
+    assert filtered.index.tolist() == [0]
@@ -0,0 +1,137 @@
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from app_utils.sheets import _row_cells, read_adviser_sheets, sheet_diff_requests, sheet_matches_snapshot
+from benchmarks.synthetic import StandInConnection
+
+COLUMNS = ["Timestamp", "Email", "First Name", "Grad Year", "Resume"]
+
+class GridSheet:
+    # in-memory stand-in for one worksheet: replays batchUpdate requests on a
+    # grid of cells and answers the reads sheet_matches_snapshot makes
+    def __init__(self, frame):
+        self.id = 0
+        self.grid = [[{"userEnteredValue": {"stringValue": str(c)}} for c in frame.columns]]
+        self.grid += [_row_cells(row) for row in frame.itertuples(index=False)]
+
+    def apply(self, requests):
+        width = len(self.grid[0])
+        for request in requests:
+            (kind, body), = request.items()
+            if kind == "deleteDimension":
+                del self.grid[body["range"]["startIndex"]:body["range"]["endIndex"]]
+            elif kind == "insertDimension":
+                start, end = body["range"]["startIndex"], body["range"]["endIndex"]
+                self.grid[start:start] = [[{} for _ in range(width)] for _ in range(end - start)]
+            elif kind == "appendCells":
+                self.grid += [list(row["values"]) for row in body["rows"]]
+            elif kind == "updateCells":
+                start = body["start"]
+                for r, row in enumerate(body["rows"]):
+                    for c, cell in enumerate(row["values"]):
+                        self.grid[start["rowIndex"] + r][start["columnIndex"] + c] = cell
+            else:
+                raise AssertionError(f"unexpected request {kind}")
+
+    def _text(self, cell):
+        value = cell.get("userEnteredValue", {})
+        if "numberValue" in value:
+            number = value["numberValue"]
+            return str(int(number)) if number.is_integer() else str(number)
+        return str(next(iter(value.values()), ""))
+
+    def _trim(self, values):
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def row_values(self, row):
+        return self._trim([self._text(cell) for cell in self.grid[row - 1]])
+
+    def col_values(self, col):
+        return self._trim([self._text(row[col - 1]) if col - 1 < len(row) else "" for row in self.grid])
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+def _random_row(rng, i):
+    return [
+        f"1/{rng.randint(1, 28)}/2024 10:{i % 60:02d}:00",
+        f"student{rng.randint(0, 40)}@uw.edu",
+        rng.choice(["Ann", "Bo", "Cy", None]),
+        rng.choice([2025.0, 2026.0, np.nan]),
+        rng.choice(["python sql", "java", "", None]),
+    ]
+
+def _edit(rng, rows):
+    rows = [list(row) for row in rows]
+    for _ in range(rng.randint(0, 8)):
+        action = rng.random()
+        if action < 0.3 and rows:
+            del rows[rng.randrange(len(rows))]
+        elif action < 0.6:
+            rows.insert(rng.randint(0, len(rows)), _random_row(rng, rng.randint(0, 999)))
+        elif action < 0.8 and rows:
+            row = rows[rng.randrange(len(rows))]
+            row[rng.randrange(1, len(COLUMNS))] = _random_row(rng, 0)[rng.randrange(1, len(COLUMNS))]
+        elif rows:
+            # duplicated rows make the row matching ambiguous
+            rows.insert(rng.randint(0, len(rows)), list(rows[rng.randrange(len(rows))]))
+    return rows
+
+def test_diff_replays_to_new_frame():
+    rng = random.Random(0)
+    for trial in range(500):
+        old_rows = [_random_row(rng, i) for i in range(rng.randint(0, 25))]
+        old, new = _frame(old_rows), _frame(_edit(rng, old_rows))
+
+        sheet = GridSheet(old)
+        sheet.apply(sheet_diff_requests(sheet.id, old, new))
+        assert sheet.grid == GridSheet(new).grid, f"trial {trial}"
+
+def test_diff_needs_rewrite_when_header_changes():
+    old = _frame([_random_row(random.Random(1), 0)])
+    assert sheet_diff_requests(0, old, old.rename(columns={"Resume": "Resume Text"})) is None
+
+def test_unchanged_frame_sends_nothing():
+    old = _frame([_random_row(random.Random(2), i) for i in range(10)])
+    assert sheet_diff_requests(0, old, old.copy()) == []
+
+def test_sheet_matches_snapshot():
+    rng = random.Random(3)
+    snapshot = _frame([_random_row(rng, i) for i in range(10)])
+    assert sheet_matches_snapshot(GridSheet(snapshot), snapshot, "Email")
+
+def test_sheet_with_blank_row_does_not_match():
+    # reads drop blank rows, so the snapshot is one row short of the sheet
+    rng = random.Random(4)
+    snapshot = _frame([_random_row(rng, i) for i in range(10)])
+    sheet = GridSheet(snapshot)
+    sheet.grid.insert(4, [{} for _ in COLUMNS])
+    assert not sheet_matches_snapshot(sheet, snapshot, "Email")
+
+def test_sheet_written_since_snapshot_does_not_match():
+    rng = random.Random(5)
+    snapshot = _frame([_random_row(rng, i) for i in range(10)])
+    sheet = GridSheet(snapshot)
+    del sheet.grid[3]
+    assert not sheet_matches_snapshot(sheet, snapshot, "Email")
+
+def test_sheet_with_other_columns_does_not_match():
+    rng = random.Random(6)
+    snapshot = _frame([_random_row(rng, i) for i in range(10)])
+    sheet = GridSheet(snapshot.drop(columns=["Grad Year"]))
+    assert not sheet_matches_snapshot(sheet, snapshot, "Email")
+
+def test_adviser_sheets_are_read_concurrently():
+    requests, book = pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"b": [3]})
+    start = time.perf_counter()
+    read_requests, read_book = read_adviser_sheets(StandInConnection(requests, 0.5), StandInConnection(book, 0.5))
+    elapsed = time.perf_counter() - start
+    # one delay, not the sum of both
+    assert elapsed < 0.8
+    pd.testing.assert_frame_equal(read_requests, requests)
+    pd.testing.assert_frame_equal(read_book, book)
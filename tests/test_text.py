@@ -0,0 +1,66 @@
+import random
+import re
+
+import pandas as pd
+
+from app_utils import text
+from app_utils.text import build_bm25_index, build_keyword_index, match_keywords, preprocess_series, preprocess_text, rank_resumes, search_terms
+
+TEXTS = pd.Series([
+    "Skilled in C++, Java and R.",
+    "Python3 / Node.js developer; C# (.NET)",
+    "java only",
+    "IT support, c++17, GPA 3.8",
+], index=[10, 11, 12, 13])
+
+def test_search_terms_keep_programming_languages():
+    assert search_terms("Skilled in C++, Java and R. (C#) .NET node.js 2023") == \
+        ["skilled", "in", "c++", "java", "and", "r", "c#", ".net", "node.js"]
+
+def test_ranking_finds_what_the_keyword_filter_finds():
+    index = build_bm25_index(TEXTS)
+    keyword_index = build_keyword_index(TEXTS)
+    for keyword in ["c++", "c#", "r", "it", "node.js", "python3", ".net", "java"]:
+        ranked = {row_id for row_id, _ in rank_resumes(index, [keyword], TEXTS.index)}
+        matched = match_keywords(keyword_index, TEXTS.index, [keyword])
+        exact = {row_id for row_id in TEXTS.index if keyword in search_terms(TEXTS[row_id])}
+        assert ranked == exact, keyword
+        assert ranked <= {row_id for row_id, kws in matched.items() if kws}, keyword
+
+def test_ranking_scores_every_keyword():
+    index = build_bm25_index(TEXTS)
+    ranked = rank_resumes(index, ["c++", "java"], TEXTS.index)
+    assert [row_id for row_id, _ in ranked] == [10, 12]
+
+# the regex pipeline preprocess_text replaced, kept as the reference for its output
+
+def old_preprocess_text(text):
+    text = text.lower()
+    text = re.sub(r'\b\w*\d\w*\b', '', text)
+    text = re.sub(r'\b\w*[^a-zA-Z\s]\w*\b', '', text)
+    text = ' '.join([w for w in text.split() if not (w.startswith('i') and len(w) <= 2)])
+    text = ' '.join([w for w in text.split() if not re.match(r'^(.)\1+$', w)])
+    return text
+
+PIECES = ["python", "Java", "c++", "c#", "node.js", "3.8", "2023", "it", "I", "in", "aaa", "zz", "x",
+          "e-mail", "snake_case", "café", "naïve", "straße", "İstanbul", "ｆｕｌｌ", "(", ")", ",", ".",
+          "/", "'s", "--", "_", "ii", "iii", "\u00b2"]
+SPACES = [" ", " ", " ", "  ", "\t", "\n", "\r\n", "\xa0", "\u2003", "\x1c", ""]
+
+def _random_text(rng):
+    return "".join(rng.choice(PIECES) + rng.choice(SPACES) for _ in range(rng.randint(0, 30)))
+
+def test_preprocess_matches_old_regex_pipeline():
+    rng = random.Random(0)
+    for _ in range(3000):
+        raw = _random_text(rng)
+        assert preprocess_text(raw) == old_preprocess_text(raw), repr(raw)
+
+def test_preprocess_series_same_in_process_pool(monkeypatch):
+    rng = random.Random(1)
+    texts = pd.Series([_random_text(rng) for _ in range(200)], index=range(100, 300))
+    serial = preprocess_series(texts, workers=1)
+    monkeypatch.setattr(text, "PARALLEL_MIN_DOCS", 10)
+    parallel = preprocess_series(texts, workers=2)
+    pd.testing.assert_series_equal(parallel, serial)
+    assert serial.tolist() == [old_preprocess_text(raw) for raw in texts]